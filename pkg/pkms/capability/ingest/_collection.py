@@ -52,6 +52,7 @@ class CollectionRuntime():
     pass
 
 from pkms.core.model import ScreeningStatus
+from contextlib import nullcontext
 import os
 
 class Collection():
@@ -74,24 +75,27 @@ class Collection():
         path_convention= 'windows' if os.name == 'nt' else 'posix'
         base_location = FileLocation.from_filesystem_path(self.base_path, path_convention=path_convention)
         file_locations = c.globber.glob(base_location)
-        for file_location in file_locations:
-            file_path = file_location.to_filesystem_path(path_convention=path_convention)
-            try:
-                if dry_run:
-                    print(f'process index: {repr(file_path)}')
-                    continue
-                screening_result = c.screener.screen([file_location])[0]
-                if screening_result.status == ScreeningStatus.APPROVED:
-                    assert screening_result.file_stamp is not None
-                    file_stamp = screening_result.file_stamp
-                    indexed_document = c.indexer.index(file_location, file_stamp)
-                    c.upserter.upsert(indexed_document)
-                    print(f'success index: {repr(file_path)}, id: {indexed_document.file_id}')
-                    count += 1
-                else:
-                    print(f'skipped index: {repr(file_path)}, reason: {screening_result.reason}')
-            except Exception as e:
-                print(f'skipped index: {repr(file_path)}, reason: {e}')
+        # One transaction for the whole collection, a single commit instead of
+        # one per file. A failed upsert only rolls back itself.
+        with (nullcontext() if dry_run else c.upserter.transaction()):
+            for file_location in file_locations:
+                file_path = file_location.to_filesystem_path(path_convention=path_convention)
+                try:
+                    if dry_run:
+                        print(f'process index: {repr(file_path)}')
+                        continue
+                    screening_result = c.screener.screen([file_location])[0]
+                    if screening_result.status == ScreeningStatus.APPROVED:
+                        assert screening_result.file_stamp is not None
+                        file_stamp = screening_result.file_stamp
+                        indexed_document = c.indexer.index(file_location, file_stamp)
+                        c.upserter.upsert(indexed_document)
+                        print(f'success index: {repr(file_path)}, id: {indexed_document.file_id}')
+                        count += 1
+                    else:
+                        print(f'skipped index: {repr(file_path)}, reason: {screening_result.reason}')
+                except Exception as e:
+                    print(f'skipped index: {repr(file_path)}, reason: {e}')
         return count
 
     def ingest_file(self, file_location:FileLocation, dry_run:bool|None=False) -> int:
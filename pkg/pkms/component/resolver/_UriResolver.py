@@ -1,7 +1,11 @@
 from dataclasses import dataclass
-from typing import Optional, Literal
+from typing import Optional, Literal, Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+import os
+import queue
 import sqlite3
-import urllib.parse
+import threading
 
 from pkms.core.component.resolver import (
     Resolver,
@@ -14,7 +18,128 @@ from pkms.core.model import (
     FileLocation,
     FileType,
 )
+from pkms.core.utility import apply_sqlite_pragmas
 
+RESOLVE_BY_ID_SQL = """
+SELECT file_id, file_uri, file_kind, title, file_extension
+FROM files
+WHERE file_id = ? AND file_extension = ?
+"""
+
+RESOLVE_BY_UID_SQL = """
+SELECT file_id, file_uri, file_kind, title, file_extension
+FROM files
+WHERE file_uid = ?
+"""
+
+RESOLVE_BY_SHA256_SQL = """
+SELECT file_id, file_uri, file_kind, title, file_extension
+FROM files
+WHERE file_hash_sha256 = ?
+"""
+
+_FILE_URI_PREFIX = "pkms:///file/"
+_FILE_URI_PREFIX_LEN = len(_FILE_URI_PREFIX)
+
+def split_pkms_uri(uri: str) -> tuple[str, str]:
+    """
+    Split a pkms URI into (authority, path).
+
+    Specialized fast path of urllib.parse.urlparse for the pkms scheme:
+    query and fragment are dropped, authority MAY be empty.
+    """
+    scheme, sep, rest = uri.partition(":")
+    if not sep or scheme.lower() != "pkms":
+        raise ValueError(f"Unsupported URI scheme: {scheme if sep else ''}")
+
+    if "#" in rest:
+        rest = rest.partition("#")[0]
+    if "?" in rest:
+        rest = rest.partition("?")[0]
+
+    if rest.startswith("//"):
+        authority, slash, path = rest[2:].partition("/")
+        return authority, slash + path
+    return "", rest
+
+class _ConnectionPool:
+    """
+    Thread-safe pool of (connection, cursor) pairs.
+
+    Connections are opened lazily up to max_size, then callers wait for a
+    released one. Each connection keeps one long-lived cursor so hot lookup
+    statements stay prepared in its statement cache.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], max_size: int):
+        self._connect = connect
+        self._max_size = max_size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._closed = False
+
+    @contextmanager
+    def cursor(self) -> Iterator[sqlite3.Cursor]:
+        conn, cursor = self._acquire()
+        try:
+            yield cursor
+        finally:
+            self._release(conn, cursor)
+
+    def _acquire(self) -> tuple[sqlite3.Connection, sqlite3.Cursor]:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Resolver is closed")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            grow = self._size < self._max_size
+            if grow:
+                self._size += 1
+        if not grow:
+            item = self._idle.get()
+            if item is None:
+                # Wake-up sentinel from close(), pass it on to other waiters
+                self._idle.put(None)
+                raise RuntimeError("Resolver is closed")
+            return item
+        try:
+            conn = self._connect()
+        except BaseException:
+            with self._lock:
+                self._size -= 1
+            raise
+        return conn, conn.cursor()
+
+    def _release(self, conn: sqlite3.Connection, cursor: sqlite3.Cursor):
+        with self._lock:
+            if not self._closed:
+                self._idle.put((conn, cursor))
+                return
+            self._size -= 1
+        cursor.close()
+        conn.close()
+
+    def close(self) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            self._closed = True
+            while True:
+                try:
+                    item = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    conn, cursor = item
+                    cursor.close()
+                    conn.close()
+                    self._size -= 1
+            # Unblock waiters, connections in use are closed on release
+            self._idle.put(None)
+        return True
 
 class UriResolverRuntime(ResolverRuntime):
     pass
@@ -22,6 +147,12 @@ class UriResolverRuntime(ResolverRuntime):
 class UriResolverConfig(ResolverConfig):
     type: Literal['UriResolverConfig'] = 'UriResolverConfig'
     db_path: str
+    # PRAGMA tuning for the read path, applied in order on connect
+    temp_store: Literal['DEFAULT', 'FILE', 'MEMORY'] = 'MEMORY'
+    cache_size: int = -64000 # negative: KiB, i.e. 64 MB
+    mmap_size: int = 268435456
+    # Max read-only connections, None: os.cpu_count()
+    pool_size: Optional[int] = None
 
 class UriResolver(Resolver):
     Config = UriResolverConfig
@@ -29,42 +160,46 @@ class UriResolver(Resolver):
 
     def __init__(self, config: UriResolverConfig, runtime: Optional[UriResolverRuntime] = None):
         super().__init__(config=config, runtime=runtime)
+        # WAL allows concurrent readers, so lookups run on a pool of
+        # read-only connections instead of serializing on a single one.
+        pool_size = self.config.pool_size or os.cpu_count() or 1
+        self._pool = _ConnectionPool(self._connect, max_size=pool_size)
 
-    def resolve(self, uri: str) -> ResolvedTarget:
-        parsed = urllib.parse.urlparse(uri)
-
-        # print(f'parsed: {parsed}',flush=True)
-        # 1. scheme
-        if parsed.scheme != "pkms":
-            raise ValueError(f"Unsupported URI scheme: {parsed.scheme}")
-
-        # 2. authority (reserved, currently unused)
-        # parsed.netloc MAY be empty, but position must exist
-        authority = parsed.netloc  # reserved for future use
-
-        # 3. path
-        path_parts = parsed.path.strip("/").split("/")
-
-        if len(path_parts) != 2:
-            raise ValueError(f"Invalid PKMS path: {parsed.path}")
-
-        resource, selector_part = path_parts
+    def _connect(self) -> sqlite3.Connection:
+        uri = Path(self.config.db_path).absolute().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        apply_sqlite_pragmas(conn, {
+            'query_only': 'ON',
+            'temp_store': self.config.temp_store,
+            'cache_size': self.config.cache_size,
+            'mmap_size': self.config.mmap_size,
+        })
+        return conn
 
-        if resource != "file":
-            raise ValueError(f"Unsupported PKMS resource: {resource}")
+    def resolve(self, uri: str) -> ResolvedTarget:
+        # Fast path: canonical "pkms:///file/<selector>:<value>.<ext>",
+        # no authority, query, fragment or extra segments
+        selector_part = uri[_FILE_URI_PREFIX_LEN:]
+        if not (
+            uri.startswith(_FILE_URI_PREFIX)
+            and "/" not in selector_part
+            and "?" not in selector_part
+            and "#" not in selector_part
+        ):
+            selector_part = self._parse_selector_part(uri)
 
         # 4. selector:value.ext
-        try:
-            selector, rest = selector_part.split(":", 1)
-        except ValueError:
+        selector, sep, rest = selector_part.partition(":")
+        if not sep:
             raise ValueError("Missing selector in PKMS URI")
 
-        if "." not in rest:
+        value, sep, ext = rest.partition(".")
+        if not sep:
             raise ValueError("File extension is required")
 
-        value_ext = rest.split(".", 1)
-        value = value_ext[0].lower()
-        ext = '.'+value_ext[1].lower() if len(value_ext) == 2 else ''
+        value = value.lower()
+        ext = '.' + ext.lower()
 
         return self._resolve_by_selector(
             selector=selector,
@@ -72,6 +207,24 @@ class UriResolver(Resolver):
             ext=ext,
         )
 
+    def _parse_selector_part(self, uri: str) -> str:
+        # 1. scheme
+        # 2. authority (reserved, currently unused)
+        # authority MAY be empty, but position must exist
+        authority, path = split_pkms_uri(uri)  # authority reserved for future use
+
+        # 3. path
+        path_parts = path.strip("/").split("/")
+
+        if len(path_parts) != 2:
+            raise ValueError(f"Invalid PKMS path: {path}")
+
+        resource, selector_part = path_parts
+
+        if resource != "file":
+            raise ValueError(f"Unsupported PKMS resource: {resource}")
+        return selector_part
+
     def _resolve_by_selector(
         self,
         *,
@@ -79,53 +232,39 @@ class UriResolver(Resolver):
         value: str,
         ext: str,
     ) -> ResolvedTarget:
-        conn = sqlite3.connect(self.config.db_path)
-        conn.row_factory = sqlite3.Row
+        if selector == "id":
+            sql, params = RESOLVE_BY_ID_SQL, (value, ext)
+        elif selector == "uid":
+            sql, params = RESOLVE_BY_UID_SQL, (value,)
+        elif selector == "sha256":
+            sql, params = RESOLVE_BY_SHA256_SQL, (value,)
+        else:
+            raise ValueError(f"Unsupported selector: {selector}")
 
-        try:
-            if selector == "id":
-                row = conn.execute(
-                    """
-                    SELECT file_id, file_uri, file_kind, title, file_extension
-                    FROM files
-                    WHERE file_id = ? AND file_extension = ?
-                    """,
-                    (value, ext),
-                ).fetchone()
-                # print(row,flush=True)
-
-            elif selector == "uid":
-                row = conn.execute(
-                    """
-                    SELECT file_id, file_uri, file_kind, title, file_extension
-                    FROM files
-                    WHERE file_uid = ?
-                    """,
-                    (value,),
-                ).fetchone()
-            elif selector == "sha256":
-                row = conn.execute(
-                    """
-                    SELECT file_id, file_uri, file_kind, title, file_extension
-                    FROM files
-                    WHERE file_hash_sha256 = ?
-                    """,
-                    (value,),
-                ).fetchone()
-            else:
-                raise ValueError(f"Unsupported selector: {selector}")
-
-            if not row:
-                raise LookupError(f"Resource not found for {selector}:{value}")
-            return ResolvedTarget(
-                status=ResolutionStatus.OK,
-                file_id=row["file_id"],
-                file_extension=row['file_extension'],
-                file_kind=row["file_kind"],
-                title=row["title"],
-                file_location=FileLocation.from_uri(row['file_uri']),
-                file_type=FileType.REGULAR,
-            )
+        with self._pool.cursor() as cursor:
+            row = cursor.execute(sql, params).fetchone()
 
-        finally:
-            conn.close()
\ No newline at end of file
+        if not row:
+            raise LookupError(f"Resource not found for {selector}:{value}")
+        return ResolvedTarget(
+            status=ResolutionStatus.OK,
+            file_id=row["file_id"],
+            file_extension=row['file_extension'],
+            file_kind=row["file_kind"],
+            title=row["title"],
+            file_location=FileLocation.from_uri(row['file_uri']),
+            file_type=FileType.REGULAR,
+        )
+
+    def close(self) -> bool:
+        """
+        Try close the internal connections to db if possible
+
+        :return: Previous connection status, (True: Closed successfully, False: Closed already)
+        :rtype: bool
+        """
+        return self._pool.close()
+
+    def __del__(self):
+        if getattr(self, '_pool', None) is not None:
+            self.close()
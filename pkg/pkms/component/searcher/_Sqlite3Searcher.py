@@ -16,7 +16,7 @@ from dataclasses import dataclass
 from typing import List
 
 # NOTE: don't use pydantic for not introducing validation overhead
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Token:
     """
     Represents a single logical search term.
@@ -6,7 +6,8 @@ from pkms.core.component.upserter import (
 )
 from pkms.core.utility import *
 
-from typing import Optional, Literal
+from typing import Optional, Literal, Iterable
+from itertools import islice
 import json
 import sqlite3
 import sys
@@ -14,10 +15,25 @@ from pathlib import Path
 from datetime import datetime, timezone
 
 
+# orjson is an optional accelerator, fallback to stdlib json when not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ---------- utils ----------
 
 def now_iso() -> str:
-    return datetime.now(timezone.utc).astimezone().isoformat()
+    return datetime.now().astimezone().isoformat(timespec='microseconds')
+
+def dumps_json(obj) -> str:
+    """
+    Serialize obj to a compact JSON string, non-ASCII characters are kept as-is.
+    Same output with or without orjson installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
 
 # ---------- DB ----------
 
@@ -26,6 +42,8 @@ CREATE TABLE IF NOT EXISTS files (
     id INTEGER PRIMARY KEY,
 
     -- Identity
+    -- UNIQUE implies an index on file_id (sqlite_autoindex_files_1),
+    -- lookups by file_id MUST NOT add a duplicated index.
     file_id TEXT NOT NULL UNIQUE,
     file_uid TEXT,
 
@@ -141,41 +159,66 @@ ON CONFLICT(file_id) DO UPDATE SET
 import json
 from datetime import datetime
 
+# Hot path binds positionally, UPSERT_SQL stays the named source of truth
+UPSERT_POSITIONAL_SQL, UPSERT_PARAM_NAMES = to_positional_sql(UPSERT_SQL)
+
+def to_upsert_params(
+    doc: IndexedDocument,
+    now: str,
+) -> tuple:
+    """
+    Convert IndexedDocument to UPSERT_POSITIONAL_SQL parameters
+
+    The document is already validated, so the parameters are emitted
+    directly without building an intermediate FilesDbRecord.
+    Values are ordered as UPSERT_PARAM_NAMES.
+    """
+    return (
+        doc.file_id,
+        doc.file_uid,
+        doc.file_uri,
+        doc.file_size,
+        doc.file_extension,
+        doc.file_hash_sha256,
+        doc.file_kind,
+        doc.importance,
+        doc.title,
+        doc.origin_uri,
+        now, # record_created_datetime
+        now, # record_updated_datetime
+        doc.file_created_datetime,
+        doc.file_modified_datetime,
+        doc.text,
+        dumps_json(doc.extra),
+    )
+
 def to_files_db_record(
     doc: IndexedDocument,
+    now_iso_: Optional[str] = None,
 ) -> FilesDbRecord:
     """
     Convert IndexedDocument to FilesDbRecord
     Pure function:
     same input -> same output
-    """
 
-    now_iso_ = now_iso()
-
-    return FilesDbRecord(
-        file_id=doc.file_id,
-        file_uid=doc.file_uid,
-        file_uri=doc.file_uri,
-        file_size=doc.file_size,
-        file_extension=doc.file_extension,
-        file_hash_sha256=doc.file_hash_sha256,
-        file_kind=doc.file_kind,
-        importance=doc.importance,
-        title=doc.title,
-        origin_uri=doc.origin_uri,
-        record_created_datetime=now_iso_,
-        record_updated_datetime=now_iso_,
-        file_created_datetime=doc.file_created_datetime,
-        file_modified_datetime=doc.file_modified_datetime,
-        text=doc.text,
-        extra=json.dumps(doc.extra, ensure_ascii=False),
-    )
+    now_iso_ can be computed once and shared by a batch of documents,
+    defaults to the current time.
+    """
+    if now_iso_ is None:
+        now_iso_ = now_iso()
+    return FilesDbRecord(**dict(zip(UPSERT_PARAM_NAMES, to_upsert_params(doc, now_iso_))))
 
 from contextlib import contextmanager
 
 class Sqlite3UpserterConfig(UpserterConfig):
     type: Literal['Sqlite3UpserterConfig'] = 'Sqlite3UpserterConfig'
     db_path: str
+    # PRAGMA tuning, applied in order on connect
+    synchronous: Literal['OFF', 'NORMAL', 'FULL', 'EXTRA'] = 'NORMAL'
+    temp_store: Literal['DEFAULT', 'FILE', 'MEMORY'] = 'MEMORY'
+    cache_size: int = -64000 # negative: KiB, i.e. 64 MB
+    mmap_size: int = 268435456
+    journal_size_limit: int = 6144000
 
 class Sqlite3UpserterRuntime(UpserterRuntime):
     pass
@@ -188,16 +231,37 @@ class Sqlite3Upserter(Upserter):
         super().__init__(config=config, runtime=runtime)
         assert self.config
         self._in_transaction = False
-        self._connection = sqlite3.connect(config.db_path)
+        self._cursor = None
+        # Autocommit mode: transactions are driven explicitly with BEGIN IMMEDIATE,
+        # instead of the implicit ones opened by the sqlite3 module on DML
+        self._connection = sqlite3.connect(config.db_path, isolation_level=None)
         self._connection.row_factory = sqlite3.Row
         self._init_db()
+        # Reused for every upsert, avoid creating a cursor per call
+        self._cursor = self._connection.cursor()
     
     def _init_db(self):
         """
         Initialize Database
         """
-        self._connection.execute("PRAGMA journal_mode=WAL;")
-        self._connection.executescript(SCHEMA_SQL)
+        config: Sqlite3UpserterConfig = self.config
+        # Pragmas and schema in one script, a single executescript() call
+        pragma_script = to_sqlite_pragma_script({
+            'journal_mode': 'WAL',
+            'synchronous': config.synchronous,
+            'temp_store': config.temp_store,
+            'cache_size': config.cache_size,
+            'mmap_size': config.mmap_size,
+            'journal_size_limit': config.journal_size_limit,
+        })
+        self._connection.executescript(pragma_script + SCHEMA_SQL)
+        # Gather planner statistics once for a newly created database,
+        # so index selection is deterministic from the first query on.
+        has_stat = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        ).fetchone()
+        if not has_stat:
+            self._connection.execute("ANALYZE;")
         self._connection.commit()
     
     # DONE: Decide Should use [IndexedDocument] vs IndexedDocument as input => Use single IndexedDocument
@@ -206,6 +270,7 @@ class Sqlite3Upserter(Upserter):
         """
         Insert or update the indexed document to database
 
+        - Shares the same write path as upsert_many().
         - Auto-commit to database by default.
         - upsert() will not commit with transaction() context, this enable batch commit.
 
@@ -221,14 +286,73 @@ class Sqlite3Upserter(Upserter):
         :param indexed_document: Description
         :type indexed_document: IndexedDocument
         """
+        self.upsert_many([indexed_document])
+
+    def upsert_many(
+        self,
+        indexed_documents: Iterable[IndexedDocument],
+        chunk_size: int = 1000,
+        commit_every: int = 1,
+    ):
+        """
+        Insert or update multiple indexed documents to database
+
+        - Documents are pulled lazily from the iterable and written with
+          executemany() in chunks of chunk_size, so memory stays O(chunk_size)
+          even for generators over large collections.
+        - Every commit_every chunks are committed as one transaction. On error,
+          only the uncommitted chunks are rolled back.
+        - Inside transaction() context, nothing is committed until the context exits.
+          A failing call is rolled back to a savepoint, earlier calls are kept.
+
+        :param indexed_documents: Documents to insert or update
+        :type indexed_documents: Iterable[IndexedDocument]
+        :param chunk_size: Number of documents written per executemany() call
+        :type chunk_size: int
+        :param commit_every: Number of chunks written per transaction
+        :type commit_every: int
+        """
         if self._connection is None:
             raise RuntimeError("Upserter is closed")
 
-        file_db_record: FilesDbRecord = to_files_db_record(indexed_document)
-        file_db_record_dict: dict = file_db_record.model_dump()
-        self._connection.execute(UPSERT_SQL, file_db_record_dict)
-        if not self._in_transaction:
-            self._connection.commit()
+        # One timestamp for the whole batch
+        now = now_iso()
+        docs = iter(indexed_documents)
+
+        if self._in_transaction:
+            # Savepoint per call, a failing call is undone on its own and the
+            # surrounding transaction() keeps the rows written so far
+            self._cursor.execute("SAVEPOINT upsert_many")
+            try:
+                while chunk := list(islice(docs, chunk_size)):
+                    self._cursor.executemany(UPSERT_POSITIONAL_SQL, (to_upsert_params(doc, now) for doc in chunk))
+            except Exception:
+                self._cursor.execute("ROLLBACK TO upsert_many")
+                self._cursor.execute("RELEASE upsert_many")
+                raise
+            self._cursor.execute("RELEASE upsert_many")
+            return
+
+        pending_chunks = 0
+        try:
+            while chunk := list(islice(docs, chunk_size)):
+                if pending_chunks == 0:
+                    self._cursor.execute("BEGIN IMMEDIATE")
+                self._cursor.executemany(UPSERT_POSITIONAL_SQL, (to_upsert_params(doc, now) for doc in chunk))
+                pending_chunks += 1
+                if pending_chunks >= commit_every:
+                    self._cursor.execute("COMMIT")
+                    pending_chunks = 0
+            if pending_chunks:
+                self._cursor.execute("COMMIT")
+        except Exception:
+            self._rollback()
+            raise
+
+    def _rollback(self):
+        # BEGIN may have failed (e.g. database is locked), only rollback an open transaction
+        if self._connection.in_transaction:
+            self._connection.execute("ROLLBACK")
 
     @contextmanager
     def transaction(self):
@@ -236,6 +360,9 @@ class Sqlite3Upserter(Upserter):
         Transaction context.
 
         - Inside the context, upsert() will NOT auto-commit.
+        - The write lock is taken up-front (BEGIN IMMEDIATE), so a concurrent
+          writer fails fast here instead of mid-transaction. Readers are not
+          blocked thanks to WAL.
         - On exit:
             - commit if no exception
             - rollback if exception raised
@@ -249,11 +376,11 @@ class Sqlite3Upserter(Upserter):
 
         try:
             self._in_transaction = True
-            self._connection.execute("BEGIN")
+            self._connection.execute("BEGIN IMMEDIATE")
             yield self
-            self._connection.commit()
+            self._connection.execute("COMMIT")
         except Exception:
-            self._connection.rollback()
+            self._rollback()
             raise
         finally:
             self._in_transaction = False
@@ -267,6 +394,9 @@ class Sqlite3Upserter(Upserter):
         """
         has_connection = self._connection is not None
         if has_connection:
+            if self._cursor is not None:
+                self._cursor.close()
+                self._cursor = None
             self._connection.close()
             del self._connection
             self._connection = None
@@ -1,7 +1,8 @@
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional, Union, Dict, List, Literal
+from typing import Optional, Union, Dict, List, Literal, Iterable
 from .base import ComponentConfig
 from .base import ComponentRuntime
 from .base import Component
@@ -28,3 +29,15 @@ class Upserter(Component):
     @abstractmethod
     def upsert(self, doc: IndexedDocument) -> None:
         ...
+
+    def upsert_many(self, docs: Iterable[IndexedDocument]) -> None:
+        for doc in docs:
+            self.upsert(doc)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group the upserts made inside the context into one unit of work.
+        Upserters without transactions just run the body.
+        """
+        yield self
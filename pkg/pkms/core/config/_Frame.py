@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Any, Iterator
 
-@dataclass
+@dataclass(slots=True)
 class Frame:
     key: None | str | int
     node: Any
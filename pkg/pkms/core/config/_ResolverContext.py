@@ -1,7 +1,7 @@
 from ._Frame import Frame
 from dataclasses import dataclass, field
 
-@dataclass
+@dataclass(slots=True)
 class ResolverContext:
     # external static immutable context
     external: dict = field(default_factory=dict)
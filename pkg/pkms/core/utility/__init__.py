@@ -3,7 +3,15 @@ import re
 import pathlib
 from ._sql import (
     extract_sql_params,
-    assert_sql_model_aligned
+    to_positional_sql,
+    assert_sql_model_aligned,
+    apply_sqlite_pragmas,
+    to_sqlite_pragma_script,
+)
+from ._jsonc import (
+    strip_jsonc_comments,
+    loads_jsonc,
+    load_jsonc,
 )
 from ._CommandParser import CommandParser
 from ._SafeNestFormatter import (
@@ -0,0 +1,46 @@
+import json
+import os
+import re
+
+# orjson is an optional accelerator, fallback to stdlib json when not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# One pass over the bytes: strings are matched first and kept as-is, so
+# comment markers inside strings (e.g. "file:///...") are left untouched.
+# Accepts what commentjson accepts: `#` and `//` line comments and trailing
+# commas, plus /* */ block comments.
+_JSONC_COMMENT = rb'(?:#|//)[^\n]*|/\*.*?\*/'
+_JSONC_TOKEN_RE = re.compile(
+    rb'"(?:\\.|[^"\\])*"'                                 # string literal
+    rb'|' + _JSONC_COMMENT +                               # comment
+    rb'|,(?=(?:\s|' + _JSONC_COMMENT + rb')*[\]}])',       # trailing comma
+    re.DOTALL,
+)
+
+def _strip_comment(m: re.Match) -> bytes:
+    token = m.group(0)
+    return token if token[:1] == b'"' else b''
+
+def strip_jsonc_comments(data: bytes) -> bytes:
+    return _JSONC_TOKEN_RE.sub(_strip_comment, data)
+
+def loads_jsonc(data: bytes | str):
+    """
+    Parse JSON with comments, a drop-in for commentjson.loads().
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    data = strip_jsonc_comments(data)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_jsonc(path: str | os.PathLike):
+    """
+    Read and parse a JSON with comments file, a drop-in for commentjson.load().
+    """
+    with open(path, 'rb') as f:
+        return loads_jsonc(f.read())
@@ -6,6 +6,15 @@ _SQL_PARAM_RE = re.compile(r":([a-zA-Z_][a-zA-Z0-9_]*)")
 def extract_sql_params(sql: str) -> Set[str]:
     return set(_SQL_PARAM_RE.findall(sql))
 
+def to_positional_sql(sql: str) -> tuple[str, tuple[str, ...]]:
+    """
+    Rewrite named parameters (:name) to positional ones (?).
+
+    :return: (positional sql, parameter names in binding order)
+    """
+    names = tuple(_SQL_PARAM_RE.findall(sql))
+    return _SQL_PARAM_RE.sub('?', sql), names
+
 
 from pydantic import BaseModel
 
@@ -25,4 +34,32 @@ def assert_sql_model_aligned(
             "SQL <-> Model alignment error\n"
             f"Missing in model: {sorted(missing)}\n"
             f"Unused in model: {sorted(extra)}"
-        )
\ No newline at end of file
+        )
+
+
+import sqlite3
+from typing import Mapping
+
+def apply_sqlite_pragmas(
+    connection: sqlite3.Connection,
+    pragmas: Mapping[str, str | int],
+):
+    """
+    Apply PRAGMA statements to the connection in the given order.
+
+    Values are formatted into the statement directly (PRAGMA does not
+    accept bound parameters), so they must come from validated config.
+    """
+    for name, value in pragmas.items():
+        connection.execute(f"PRAGMA {name}={value};")
+
+def to_sqlite_pragma_script(
+    pragmas: Mapping[str, str | int],
+) -> str:
+    """
+    Render PRAGMA statements as a script, e.g. to prepend to a schema
+    script and run everything with a single executescript() call.
+
+    Same value rules as apply_sqlite_pragmas().
+    """
+    return "".join(f"PRAGMA {name}={value};\n" for name, value in pragmas.items())
@@ -35,6 +35,7 @@ import argparse
 import base64
 import mimetypes
 import math
+import os
 import re
 import sys
 import string
@@ -449,6 +450,9 @@ class OdtToHtmlConverter:
         self.use_h1_title = config.title_from_h1
         self.use_filename_title = config.title_from_filename
         self.title_fallback = config.title_fallback
+        # Escaped once, reused whenever the configured fallback becomes the title
+        self._escaped_title_fallback = escape(self.title_fallback) if self.title_fallback else ''
+        self.title_candidates: dict = self._new_title_candidates()
 
     def convert(self, file: Union[StrPath,bytes,IO[bytes]], title: Optional[str]=None, title_fallback: Optional[str]=None, filename: Optional[StrPath]=None) -> str:
         """Convert the ODT file to HTML string."""
@@ -485,7 +489,7 @@ class OdtToHtmlConverter:
         
             # Determine title
             filename = file if isinstance(file, (str, Path)) else filename
-            doc_title = self._determine_title(odt_zip, content_xml, title=title, title_fallback=title_fallback, filename=filename)
+            doc_title = self._determine_title(odt_zip, title=title, title_fallback=title_fallback, filename=filename)
         
         return self._wrap_html(html_body, doc_title)
 
@@ -927,45 +931,39 @@ class OdtToHtmlConverter:
             
         return None
 
-    def _find_title_candidates(self, content_xml: str) -> dict:
-        """Parse content to find title candidates (styled title, h1)."""
-        candidates = {'styled_title': None, 'h1_title': None}
-        
-        try:
-            root = ET.fromstring(content_xml)
-            body = root.find(f".//{{{NAMESPACES['office']}}}text")
-            if body is None:
-                return candidates
-                
-            # Iterate through direct children to find first candidates
-            for child in body:
-                tag = child.tag.split('}')[-1]
-                
-                # Check for "Title" style (including parent style inheritance)
-                if tag == 'p' and not candidates['styled_title']:
-                    style_name = child.get(f"{{{NAMESPACES['text']}}}style-name", "")
-                    if self._is_title_style(style_name, root):
-                        text_content = "".join(child.itertext()).strip()
-                        if text_content:
-                            candidates['styled_title'] = text_content
-                
-                # Check for Heading 1
-                if tag == 'h' and not candidates['h1_title']:
-                    level = child.get(f"{{{NAMESPACES['text']}}}outline-level", "1")
-                    if level == "1":
-                        text_content = "".join(child.itertext()).strip()
-                        if text_content:
-                            candidates['h1_title'] = text_content
-                
-                if candidates['styled_title'] and candidates['h1_title']:
-                    break
-                    
-        except Exception:
-            pass
-            
-        return candidates
+    def _new_title_candidates(self) -> dict:
+        """Create an empty title candidates record."""
+        return {'styled_title': None, 'h1_title': None}
 
-    def _is_title_style(self, style_name: str, root: ET.Element) -> bool:
+    def _collect_style_parents(self, root: ET.Element) -> dict[str, str]:
+        """Map style name to parent style name for the styles defined in root."""
+        style_parents = {}
+        for style in root.iter(f"{{{NAMESPACES['style']}}}style"):
+            style_name = style.get(f"{{{NAMESPACES['style']}}}name")
+            # Keep the first definition, matching a document-order lookup
+            if style_name and style_name not in style_parents:
+                style_parents[style_name] = style.get(f"{{{NAMESPACES['style']}}}parent-style-name")
+        return style_parents
+
+    def _update_title_candidates(self, child: ET.Element, tag: str, candidates: dict, style_parents: dict[str, str]) -> None:
+        """Record child as a title candidate (styled title, h1) if none is found yet."""
+        # Check for "Title" style (including parent style inheritance)
+        if tag == 'p' and not candidates['styled_title']:
+            style_name = child.get(f"{{{NAMESPACES['text']}}}style-name", "")
+            if self._is_title_style(style_name, style_parents):
+                text_content = "".join(child.itertext()).strip()
+                if text_content:
+                    candidates['styled_title'] = text_content
+
+        # Check for Heading 1
+        if tag == 'h' and not candidates['h1_title']:
+            level = child.get(f"{{{NAMESPACES['text']}}}outline-level", "1")
+            if level == "1":
+                text_content = "".join(child.itertext()).strip()
+                if text_content:
+                    candidates['h1_title'] = text_content
+
+    def _is_title_style(self, style_name: str, style_parents: dict[str, str]) -> bool:
         """Check if a style is a Title style, including parent style inheritance."""
         if not style_name:
             return False
@@ -974,28 +972,17 @@ class OdtToHtmlConverter:
         if 'title' in style_name.lower():
             return True
         
-        # Check parent style chain using parsed styles or the XML
+        # Check parent style chain
         visited = set()  # Prevent infinite loops
         current_style = style_name
         
         while current_style and current_style not in visited:
             visited.add(current_style)
             
-            # First check in self.styles (which has already parsed parent-style-name)
-            # But self.styles may not have parent-style-name stored directly.
-            # Let's search the XML for the style definition
-            
-            # Find style in automatic-styles or office:styles
-            style_elem = None
-            for style in root.iter(f"{{{NAMESPACES['style']}}}style"):
-                if style.get(f"{{{NAMESPACES['style']}}}name") == current_style:
-                    style_elem = style
-                    break
-            
-            if style_elem is None:
+            if current_style not in style_parents:
                 break
                 
-            parent_style = style_elem.get(f"{{{NAMESPACES['style']}}}parent-style-name")
+            parent_style = style_parents[current_style]
             if parent_style:
                 if 'title' in parent_style.lower():
                     return True
@@ -1005,7 +992,7 @@ class OdtToHtmlConverter:
                 
         return False
 
-    def _determine_title(self, odt_zip: zipfile.ZipFile, content_xml: str, title: Optional[str], title_fallback: Optional[str], filename: Optional[StrPath]=None) -> str:
+    def _determine_title(self, odt_zip: zipfile.ZipFile, title: Optional[str], title_fallback: Optional[str], filename: Optional[StrPath]=None) -> str:
         """Determine the document title based on precedence rules."""
 
         # 1. User Specified title
@@ -1020,10 +1007,8 @@ class OdtToHtmlConverter:
             if meta_title:
                 return meta_title
         
-        # Parse content candidates if needed
-        candidates = None
-        if self.use_styled_title or self.use_h1_title:
-            candidates = self._find_title_candidates(content_xml)
+        # Content candidates are collected while converting content
+        candidates = self.title_candidates
             
         # 3. Styled Title
         if self.use_styled_title and candidates and candidates['styled_title']:
@@ -1065,6 +1050,11 @@ class OdtToHtmlConverter:
         """Convert ODT content XML to HTML body content."""
         root = ET.fromstring(content_xml)
         
+        # Title candidates are gathered in the same pass over the body
+        self.title_candidates = self._new_title_candidates()
+        candidates = self.title_candidates if (self.use_styled_title or self.use_h1_title) else None
+        style_parents = self._collect_style_parents(root) if candidates is not None else {}
+
         # Find the body/text element
         body = root.find(f".//{{{NAMESPACES['office']}}}text")
         if body is None:
@@ -1114,6 +1104,9 @@ class OdtToHtmlConverter:
         for child in body:
             tag = child.tag.split('}')[-1]
             
+            if candidates is not None:
+                self._update_title_candidates(child, tag, candidates, style_parents)
+
             # Check for page breaks
             is_break = False
             
@@ -2682,47 +2675,7 @@ class OdtToHtmlConverter:
         'Noto Sans CJK TC': "'Noto Sans CJK TC', 'Microsoft JhengHei', 'SimHei', sans-serif",
     }
 
-    def _minify_css(self, content):
-        """
-        Minify css but preserve newline for minimal readablity.
-        
-        :param content: the css content
-        """
-        # Remove css comments
-        content = re.sub(r"/\*.*?\*/", "", content, flags=re.DOTALL)
-        # Remove starting white sapces
-        content = re.sub(r"^\s+", "", content, flags=re.MULTILINE)
-        # Remove ws after seperator
-        # content = re.sub(r"(?<=[,:;])[\t\r ]+", "", content, flags=re.MULTILINE)
-        # Remove ws before open-brace
-        # content = re.sub(r"\s+(?={)", "", content, flags=re.MULTILINE)
-        return content
-
-    def _minify_html(self, content):
-        # Remove html comments 
-        content = re.sub(r"<!--.*?-->", "", content, flags=re.DOTALL)
-        # Remove starting white sapces
-        content = re.sub(r"^\s+", "", content, flags=re.MULTILINE)
-        return content
-
-    def _wrap_html(self, body_content: str, title: str = "") -> str:
-        """Wrap the body content in a complete HTML document."""
-        # Build font-family CSS variables for commonly used fonts
-        # Map ODF fonts to system font stacks for offline viewing
-        font_stack_map = self._FONT_STACK_MAP
-        
-        # Generate CSS custom properties for fonts used in the document
-        font_css_vars = []
-        for style_props in self.styles.values():
-            if 'font-family' in style_props:
-                font = style_props['font-family'].strip("'\"")
-                if ',' in font:
-                    font = font.split(',')[0].strip().strip("'\"")
-                if font in font_stack_map:
-                    # Update the style to use the full font stack
-                    style_props['font-family'] = font_stack_map[font]
-        
-        main_css = """
+    _MAIN_CSS = """
         body {
             position: relative;
             z-index: -990;
@@ -2868,9 +2821,8 @@ class OdtToHtmlConverter:
             margin: 0.5em 0;
         }
 """
-        page_break_css = ""
-        if self.show_page_breaks:
-            page_break_css = """
+
+    _PAGE_BREAK_CSS = """
         .page-break {
             page-break-before: always;
             border: none;
@@ -2892,9 +2844,8 @@ class OdtToHtmlConverter:
             color: #999;
         }
 """
-        if title is None: 
-            title = ''
-        html_format_str = '''<!DOCTYPE html>
+
+    _HTML_FORMAT_STR = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -2910,10 +2861,68 @@ class OdtToHtmlConverter:
 {body_content}
 </body>
 </html>'''
-        main_css = self._minify_css(main_css)
-        html_format_str = self._minify_html(html_format_str)
+
+    # Minified (main_css, html_format_str), computed once and shared by all instances
+    _minified_html_parts: Optional[tuple[str, str]] = None
+
+    def _get_minified_html_parts(self) -> tuple[str, str]:
+        """Get the minified static css and html template, minify them on first use."""
+        parts = OdtToHtmlConverter._minified_html_parts
+        if parts is None:
+            parts = (self._minify_css(self._MAIN_CSS), self._minify_html(self._HTML_FORMAT_STR))
+            OdtToHtmlConverter._minified_html_parts = parts
+        return parts
+
+    def _minify_css(self, content):
+        """
+        Minify css but preserve newline for minimal readablity.
+        
+        :param content: the css content
+        """
+        # Remove css comments
+        content = re.sub(r"/\*.*?\*/", "", content, flags=re.DOTALL)
+        # Remove starting white sapces
+        content = re.sub(r"^\s+", "", content, flags=re.MULTILINE)
+        # Remove ws after seperator
+        # content = re.sub(r"(?<=[,:;])[\t\r ]+", "", content, flags=re.MULTILINE)
+        # Remove ws before open-brace
+        # content = re.sub(r"\s+(?={)", "", content, flags=re.MULTILINE)
+        return content
+
+    def _minify_html(self, content):
+        # Remove html comments 
+        content = re.sub(r"<!--.*?-->", "", content, flags=re.DOTALL)
+        # Remove starting white sapces
+        content = re.sub(r"^\s+", "", content, flags=re.MULTILINE)
+        return content
+
+    def _wrap_html(self, body_content: str, title: str = "") -> str:
+        """Wrap the body content in a complete HTML document."""
+        # Build font-family CSS variables for commonly used fonts
+        # Map ODF fonts to system font stacks for offline viewing
+        font_stack_map = self._FONT_STACK_MAP
+        
+        # Generate CSS custom properties for fonts used in the document
+        font_css_vars = []
+        for style_props in self.styles.values():
+            if 'font-family' in style_props:
+                font = style_props['font-family'].strip("'\"")
+                if ',' in font:
+                    font = font.split(',')[0].strip().strip("'\"")
+                if font in font_stack_map:
+                    # Update the style to use the full font stack
+                    style_props['font-family'] = font_stack_map[font]
+        
+        main_css, html_format_str = self._get_minified_html_parts()
+        page_break_css = self._PAGE_BREAK_CSS if self.show_page_breaks else ""
+        if not title:
+            escaped_title = ''
+        elif title is self.title_fallback:
+            escaped_title = self._escaped_title_fallback
+        else:
+            escaped_title = escape(title)
         result = html_format_str.format(
-            title=escape(title),
+            title=escaped_title,
             main_css=main_css,
             page_break_css=page_break_css,
             body_content=body_content
@@ -2982,6 +2991,11 @@ Examples:
         
         print(f"Successfully converted: {input_path} -> {output_path}")
         
+    except BrokenPipeError:
+        # Output pipe closed early (e.g. piped into head), nothing left to report.
+        # Point stdout to devnull so the final flush at exit won't raise again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(0)
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -2,15 +2,21 @@ import logging
 from loguru import logger
 import sys
 
+_LOGGING_FILE = logging.__file__
+
 class InterceptHandler(logging.Handler):
+    __slots__ = ()
+
     def emit(self, record: logging.LogRecord):
         try:
             level = logger.level(record.levelname).name
         except ValueError:
             level = record.levelno
 
-        frame, depth = logging.currentframe(), 2
-        while frame and frame.f_code.co_filename == logging.__file__:
+        # Find the caller that issued the record: skip this frame, then
+        # every frame inside the logging module itself
+        frame, depth = sys._getframe(1), 1
+        while frame and frame.f_code.co_filename == _LOGGING_FILE:
             frame = frame.f_back
             depth += 1
 
@@ -19,12 +25,23 @@ class InterceptHandler(logging.Handler):
             exception=record.exc_info,
         ).log(level, record.getMessage())
     
+def _noop(*args, **kwargs):
+    pass
+
 class NullLogger:
+    """
+    Logger that silently discards every call.
+
+    Any attribute resolves to the same shared no-op, so call sites using
+    methods beyond the common level names (e.g. ``trace``, ``exception``,
+    ``log``) are covered as well.
+    """
+    __slots__ = ()
+
     def __init__(self,/, *args, **kwargs): pass
-    def debug(self, /, *a, **kw): pass
-    def info(self, /, *a, **kw): pass
-    def warning(self, /, *a, **kw): pass
-    def error(self, /, *a, **kw): pass
-    def critical(self, /, *a, **kw): pass
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _noop
 
 default_null_logger = NullLogger()
\ No newline at end of file
@@ -6,7 +6,14 @@ import urllib
 import argparse
 import sqlite3
 import pathlib
-import traceback 
+import concurrent.futures
+import contextlib
+import functools
+import glob
+import gzip
+import hashlib
+import threading
+import time
 from loguru import logger
 
 from fastapi import FastAPI, Depends, HTTPException, Query
@@ -14,6 +21,13 @@ from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, HTML
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
+# uvloop is an optional accelerator (not available on Windows),
+# fallback to the default asyncio event loop when not installed
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from pkms.core.component.searcher import (
     Searcher,
     SearcherConfig,
@@ -51,15 +65,28 @@ import urllib.parse
 import urllib.request
 import os
 
+_IS_WINDOWS = os.name == 'nt'
+
 def file_uri_to_path(uri: str) -> str:
     """Convert a file URI to a local filesystem path."""
-    parsed = urllib.parse.urlparse(uri)
-    if parsed.scheme != 'file':
+    scheme, sep, rest = uri.partition(':')
+    if not sep or scheme.lower() != 'file':
         raise ValueError(f"Not a file URI: {uri}")
-    
-    # Decode percent-encoded characters
-    path = urllib.request.url2pathname(parsed.path)
-    
+
+    # Drop fragment, query and authority, keep the path only
+    if '#' in rest:
+        rest = rest.partition('#')[0]
+    if '?' in rest:
+        rest = rest.partition('?')[0]
+    if rest.startswith('//'):
+        slash_index = rest.find('/', 2)
+        rest = rest[slash_index:] if slash_index >= 0 else ''
+
+    if not _IS_WINDOWS:
+        # Decode percent-encoded characters, only when there is any
+        return urllib.parse.unquote(rest) if '%' in rest else rest
+
+    path = urllib.request.url2pathname(rest)
     # Fix leading slash issue on Windows
     if len(path) > 2 and path.startswith('/') and path[1].isalpha() and path[2] == ':':
         path = path[1:]
@@ -78,7 +105,7 @@ from pkms.lib.odt_to_html import OdtToHtmlConverter
 
 class HtmlRepresenter():
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 256, cache_dir: Optional[str] = None):
         md_config = MarkdownToHtmlConverter.Config(
             title=None,
             title_from_metadata=True,
@@ -98,46 +125,166 @@ class HtmlRepresenter():
             show_page_breaks=False,
         )
         self.odt_converter = OdtToHtmlConverter(config=odt_config)
-
-    def represent(self, file_path):
-        path = pathlib.Path(file_path)
-        if path.suffix == '.odt':
-            result = self.odt_converter.convert(file_path,title=None)
-        elif path.suffix == '.md':
-            result = self.md_converter.convert(file_path,title=None)
+        # Bound once, the cache-miss path skips the method lookups
+        self._md_convert = self.md_converter.convert
+        self._odt_convert = self.odt_converter.convert
+        # Converted html keyed by (path, mtime_ns, size, suffix),
+        # a modified file gets a new key, stale entries age out of the LRU.
+        self._convert_cached = functools.lru_cache(maxsize=cache_size)(self._convert)
+        self._gzip_cached = functools.lru_cache(maxsize=cache_size)(self._gzip)
+        # Optional on-disk cache under the same key, survives restarts
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _convert(self, file_path: str, mtime_ns: int, size: int, suffix: str) -> bytes:
+        if self.cache_dir is None:
+            return self._convert_file(file_path, suffix)
+
+        path_digest = hashlib.sha1(file_path.encode('utf-8')).hexdigest()
+        cache_path = os.path.join(self.cache_dir, f'{path_digest}.{mtime_ns}.{size}.html')
+        try:
+            with open(cache_path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+
+        result = self._convert_file(file_path, suffix)
+        # Drop renders of older versions of the same file
+        for stale_path in glob.glob(os.path.join(glob.escape(self.cache_dir), f'{path_digest}.*.html')):
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+        # Write then rename, readers never see a partial file
+        tmp_path = f'{cache_path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(result)
+        os.replace(tmp_path, cache_path)
         return result
 
+    def _convert_file(self, file_path: str, suffix: str) -> bytes:
+        if suffix == '.odt':
+            result = self._odt_convert(file_path,title=None)
+        elif suffix == '.md':
+            result = self._md_convert(file_path,title=None)
+        else:
+            raise ValueError(f"Unsupported extension: {suffix}")
+        # Cached pre-encoded, so cache hits are sent without re-encoding
+        return result.encode('utf-8')
+
+    def _gzip(self, file_path: str, mtime_ns: int, size: int, suffix: str) -> bytes:
+        # mtime=0: deterministic output for identical html
+        return gzip.compress(self._convert_cached(file_path, mtime_ns, size, suffix), mtime=0)
+
+    def _cache_key(self, file_path, stat_result: Optional[os.stat_result]) -> tuple[str, int, int, str]:
+        file_path = os.fspath(file_path)
+        st = stat_result if stat_result is not None else os.stat(file_path)
+        suffix = os.path.splitext(file_path)[1].lower()
+        return file_path, st.st_mtime_ns, st.st_size, suffix
+
+    def represent_bytes(self, file_path, stat_result: Optional[os.stat_result] = None) -> bytes:
+        """
+        Same as represent(), but returns the utf-8 encoded html.
+        """
+        return self._convert_cached(*self._cache_key(file_path, stat_result))
+
+    def represent_gzip(self, file_path, stat_result: Optional[os.stat_result] = None) -> bytes:
+        """
+        Same as represent_bytes(), but gzip compressed.
+        Compressed once per file version and cached.
+        """
+        return self._gzip_cached(*self._cache_key(file_path, stat_result))
+
+    def represent(self, file_path, stat_result: Optional[os.stat_result] = None) -> str:
+        return self.represent_bytes(file_path, stat_result=stat_result).decode('utf-8')
+
 # --------- Middleware ------------
 
 from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class HeaderMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        response.headers["Referrer-Policy"] = "no-referrer"
-        # response.headers["Content-Security-Policy"] = "default-src 'self'"
-        return response
+class HeaderMiddleware:
+    """
+    Pure ASGI middleware adding fixed security headers to every http response.
+    Avoids BaseHTTPMiddleware's per-request task and response re-wrapping.
+    """
+    HEADERS = [
+        (b"referrer-policy", b"no-referrer"),
+        # (b"content-security-policy", b"default-src 'self'"),
+    ]
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *self.HEADERS]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 # ---------- App Factory ----------
 
+# Worker threads for blocking SQLite / filesystem / conversion calls,
+# keeps the event loop free while the DB executes.
+DB_EXECUTOR_MAX_WORKERS = min(8, os.cpu_count() or 1)
+# Seconds a resolved /api/view id is reused before hitting the DB again
+RESOLVE_CACHE_TTL = 60.0
+
+# Handler convention:
+# - async def: no blocking work at all (precomputed bytes, pure logic),
+#   runs directly on the event loop without a threadpool hop.
+# - async def + run_blocking(): SQLite / filesystem / conversion work,
+#   dispatched to db_executor so the event loop is never blocked.
+# - plain def: other blocking work, FastAPI runs it in its threadpool.
 def create_app(searcher: "Searcher", resolver: "UriResolver", representer: HtmlRepresenter) -> FastAPI:
-    app = FastAPI(title="PKMS Search WebApp")
+    db_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=DB_EXECUTOR_MAX_WORKERS,
+        thread_name_prefix="pkms-web-db",
+    )
+
+    # searcher, resolver and representer are built once by the caller and
+    # shared by all requests, the lifespan only releases them on shutdown.
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # -------------------- STARTUP --------------------
+        print("Startup")
+        yield
+        # -------------------- SHUTDOWN -------------------
+        print("Shutdown –")
+        db_executor.shutdown(wait=True)
+        resolver.close()
+
+    app = FastAPI(title="PKMS Search WebApp", lifespan=lifespan)
     app.add_middleware(HeaderMiddleware)
 
-    static_dir = os.path.join(os.path.dirname(__file__), "static")
+    here = os.path.dirname(__file__)
+    static_dir = os.path.join(here, "static")
+    # Small, fixed shell files, read once instead of open + stat per request
+    index_bytes = pathlib.Path(here, "index.html").read_bytes()
+    favicon_bytes = pathlib.Path(here, "favicon-20260118_115236-64x64-wcbg.ico").read_bytes()
 
-    # # -------------------- STARTUP --------------------
-    @app.on_event("startup")
-    async def _startup() -> None:
-        print("Startup")
+    async def run_blocking(func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(db_executor, func, *args)
 
-    # -------------------- SHUTDOWN -------------------
-    @app.on_event("shutdown")
-    async def _shutdown() -> None:
-        print("Shutdown –")
+    # id -> ResolvedTarget, entries expire when the ttl bucket rolls over,
+    # so re-ingested files are picked up within RESOLVE_CACHE_TTL seconds.
+    # Misses (exceptions) are not cached.
+    @functools.lru_cache(maxsize=4096)
+    def resolve_id_cached(id: str, ttl_bucket: int) -> ResolvedTarget:
+        return resolver.resolve(f"pkms:///file/id:{id}")
+
+    def resolve_id(id: str) -> ResolvedTarget:
+        return resolve_id_cached(id, int(time.monotonic() // RESOLVE_CACHE_TTL))
 
     app.mount(
         "/static",
@@ -146,14 +293,13 @@ def create_app(searcher: "Searcher", resolver: "UriResolver", representer: HtmlR
     )
 
     @app.get("/", include_in_schema=False)
-    def index():
+    async def index():
         """
         Web shell entrypoint.
         Client-side loads actual app (search/view/editor).
         """
         logger.info(f'HeeeeeeeeeeeeeeeeY')
-        index_path = os.path.join(os.path.dirname(__file__), "index.html")
-        return FileResponse(index_path)
+        return Response(index_bytes, media_type="text/html")
 
     @app.get("/app/{app_path:path}/app.{ext}", include_in_schema=False)
     def app_(app_path: str, ext: str):
@@ -178,7 +324,7 @@ def create_app(searcher: "Searcher", resolver: "UriResolver", representer: HtmlR
         return FileResponse(file_path)       # path = os.path.join(base, f"{app_name}")
 
     @app.get("/api/ready", response_model=ReadyStatus)
-    def ready():
+    async def ready():
         """
         Dispatcher-facing readiness probe.
         Must be fast, side-effect free, and reliable.
@@ -195,7 +341,7 @@ def create_app(searcher: "Searcher", resolver: "UriResolver", representer: HtmlR
         )
 
     @app.get("/api/search", response_model=None)
-    def search(
+    async def search(
         q: str = Query(..., description="Search query"),
         limit: int = Query(20, ge=1),
         offset: int = Query(0, ge=0),
@@ -206,34 +352,51 @@ def create_app(searcher: "Searcher", resolver: "UriResolver", representer: HtmlR
             offset=offset,
         )
 
-        result: SearchResult = searcher.search(args)
-        return result.model_dump()
+        result: SearchResult = await run_blocking(searcher.search, args)
+        # Serialize with pydantic's compiled serializer, skip the
+        # model_dump() + jsonable_encoder + json.dumps round trip
+        return Response(result.model_dump_json(), media_type="application/json")
+
+    def load_view(id: str, accept_gzip: bool) -> Response:
+        """
+        Blocking part of view(): resolve, stat and represent.
+        """
+        resolved = resolve_id(id)
+        path_convention = 'windows' if os.name == 'nt' else 'posix'
+        file_path = resolved.file_location.to_filesystem_path(path_convention=path_convention)
+
+        # Stat once, raises FileNotFoundError, reused by the response below
+        st = os.stat(file_path)
+
+        if resolved.file_extension == '.html':
+            # Known media type, skip FileResponse's mimetypes lookup
+            return FileResponse(file_path, stat_result=st, media_type='text/html')
+        elif accept_gzip:
+            representation: bytes = representer.represent_gzip(file_path, stat_result=st)
+            return HTMLResponse(representation, headers={
+                "Content-Encoding": "gzip",
+                "Vary": "Accept-Encoding",
+            })
+        else:
+            representation: bytes = representer.represent_bytes(file_path, stat_result=st)
+            return HTMLResponse(representation, headers={"Vary": "Accept-Encoding"})
 
     @app.get("/api/view/{id}", response_class=Response)
-    def view(id: str):
+    async def view(id: str, request: Request):
+        accept_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
         try:
-            resolved = resolver.resolve(f"pkms:///file/id:{id}")
-            path_convention = 'windows' if os.name == 'nt' else 'posix'
-            file_path = resolved.file_location.to_filesystem_path(path_convention=path_convention)
-
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(file_path)
-            
-            if resolved.file_extension == '.html':
-                return FileResponse(file_path)
-            else:
-                representation: str = representer.represent(file_path)
-                return HTMLResponse(representation)
-
-        except Exception as e:
-            reason=''.join(traceback.format_exception(None, e, e.__traceback__))
+            return await run_blocking(load_view, id, accept_gzip)
+
+        # Expected misses only: bad id, unknown record, missing file.
+        # Anything else is a server error, left to FastAPI (500).
+        except (LookupError, ValueError, FileNotFoundError) as e:
             raise HTTPException(
                 status_code=404,
-                detail=f"id:{id} NOT FOUND, reason={reason!r}",
+                detail=f"id:{id} NOT FOUND, reason={e!r}",
             )
 
     @app.get("/redirect")
-    def redirect(target: str = Query(..., description="Target URL to redirect to")):
+    async def redirect(target: str = Query(..., description="Target URL to redirect to")):
         if not target.startswith(("http://", "https://")):
             raise HTTPException(
                 status_code=400,
@@ -242,9 +405,12 @@ def create_app(searcher: "Searcher", resolver: "UriResolver", representer: HtmlR
         return RedirectResponse(url=target, status_code=302)
     # Handle favicon.ico requests gracefully
     @app.get("/favicon.png", include_in_schema=False)
-    def favicon():
-        # Direct serving from the mounted static directory
-        return FileResponse(f"{os.path.dirname(__file__)}/favicon-20260118_115236-64x64-wcbg.ico")
+    async def favicon():
+        return Response(
+            favicon_bytes,
+            media_type="image/vnd.microsoft.icon",
+            headers={"Cache-Control": "public, max-age=3600"},
+        )
 
     return app
 
@@ -292,6 +458,12 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
         help="Bind port (default: 43472)",
     )
 
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory to persist rendered html (default: disabled)",
+    )
+
     parser.add_argument(
         "--reload",
         action="store_true",
@@ -375,7 +547,7 @@ def main(argv: list[str] = []) -> int:
     searcher = Sqlite3Searcher(config=searcher_config)
     resolver_config = UriResolver.Config(db_path = args.db_path)
     resolver = UriResolver(config=resolver_config)
-    representer = HtmlRepresenter()
+    representer = HtmlRepresenter(cache_dir=args.cache_dir)
     app = create_app(searcher, resolver, representer)
 
     network_resolver = NetworkResolver()
@@ -388,13 +560,19 @@ def main(argv: list[str] = []) -> int:
         host='127.0.0.1',
         port=args.port,
         reload=args.reload,
+        # httptools when installed, h11 otherwise
+        http="auto",
         # avoid uvicorn override logger settings
         log_config=None,
         log_level=None,
     )
 
+    # The server runs in our own event loop (pre-bound sockets), so pick
+    # the loop implementation here rather than via uvicorn's loop option.
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+
     try:
-        code = asyncio.run(async_serve(app,cfg,bind_ips))
+        code = asyncio.run(async_serve(app,cfg,bind_ips), loop_factory=loop_factory)
     except KeyboardInterrupt:
         logger.info('keyboard interrupt')
         code = 0
@@ -16,6 +16,10 @@ def setup_logging():
     logger.add(
         sys.stderr,
         level="DEBUG",
+        # only kick in when an exception is logged, no per-request cost
         backtrace=True,
         diagnose=True,
+        # format + write on loguru's worker thread, off the request path,
+        # queued messages are flushed by loguru at exit
+        enqueue=True,
     )
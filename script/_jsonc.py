@@ -0,0 +1,28 @@
+import json
+import re
+from pathlib import Path
+
+# One pass over the text: strings are matched first and kept as-is, so
+# comment markers inside strings (e.g. "https://...") are left untouched.
+_JSONC_TOKEN_RE = re.compile(
+    r'"(?:\\.|[^"\\])*"'  # string literal
+    r'|//[^\n]*'          # // line comment
+    r'|/\*.*?\*/',        # /* block comment */
+    re.DOTALL,
+)
+
+def _strip_comment(m: re.Match) -> str:
+    token = m.group(0)
+    return token if token[0] == '"' else ''
+
+def strip_jsonc_comments(text: str) -> str:
+    return _JSONC_TOKEN_RE.sub(_strip_comment, text)
+
+def load_jsonc(path: Path) -> dict:
+    """
+    Very simple JSONC loader:
+    - strips // line comments
+    - strips /* */ block comments, also inline or spanning lines
+    """
+    text = path.read_text(encoding="utf-8")
+    return json.loads(strip_jsonc_comments(text))
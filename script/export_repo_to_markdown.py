@@ -1,64 +1,83 @@
 import subprocess
 import argparse
 import fnmatch
+import re
 from pathlib import Path
 import os
+import concurrent.futures
+
+_BACKTICK_RUN_RE = re.compile(r"`+")
 
 def safe_backtick_wrapper(content: str, language: str = "") -> str:
     """
     Wrap file content in a Markdown code block, avoiding backtick conflicts.
+    The fence is one backtick longer than the longest backtick run, at least 3.
     """
-    max_backticks = 3
-    for line in content.splitlines():
-        if "```" in line:
-            max_backticks = max(max_backticks, line.count("`") + 1)
-    wrapper = "`" * max_backticks
+    longest_run = max(map(len, _BACKTICK_RUN_RE.findall(content)), default=0)
+    wrapper = "`" * max(3, longest_run + 1)
     return f"{wrapper}{language}\n{content}\n{wrapper}"
 
-def is_binary_file(path: Path) -> bool:
+def count_lines(content: str) -> int:
     """
-    Detect binary files by scanning first 1024 bytes for null bytes.
+    Count lines the way readlines() splits them ("\n", "\r\n" or "\r"),
+    without materializing the list of lines.
     """
-    try:
-        with path.open("rb") as f:
-            chunk = f.read(1024)
-            if b"\0" in chunk:
-                return True
-    except Exception:
-        return True
-    return False
+    count = content.count("\n") + content.count("\r") - content.count("\r\n")
+    if content and not content.endswith(("\n", "\r")):
+        count += 1
+    return count
+
+def is_binary_content(content: bytes) -> bool:
+    """
+    Detect binary content by scanning first 1024 bytes for null bytes.
+    """
+    return b"\0" in content[:1024]
 
 def get_git_files(repo_dir: Path):
     """
     List tracked + untracked (non-ignored) files using git.
     """
+    # -z: NUL separated and unquoted paths, captured as bytes and only
+    # decoded for the paths that are kept
     result = subprocess.run(
-        ["git", "ls-files", "--cached", "--others", "--exclude-standard"],
+        ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
         cwd=str(repo_dir),
         capture_output=True,
-        text=True,
         check=True
     )
-    lines = result.stdout.splitlines()
-    files = [path for path in lines if os.path.isfile(path)]
+    files = [
+        os.fsdecode(path) for path in result.stdout.split(b"\0")
+        if path and os.path.isfile(path)
+    ]
     files.sort()
     return files
 
-def should_skip_file(file: str, patterns: list[str]) -> bool:
+def compile_patterns(patterns: list[str] | None) -> re.Pattern | None:
     """
-    Check if file path matches any user-specified skip pattern.
+    Compile glob patterns into one alternation regex, None if no patterns.
+    Matches like fnmatch.fnmatch (case-normalized by os.path.normcase).
     """
     if not patterns:
-        return False
-    return any(fnmatch.fnmatch(file, pat) for pat in patterns)
+        return None
+    return re.compile("|".join(
+        f"(?:{fnmatch.translate(os.path.normcase(pat))})" for pat in patterns
+    ))
 
-def should_keep_file(file: str, patterns: list[str]) -> bool:
+def should_skip_file(file: str, pattern_re: re.Pattern | None) -> bool:
     """
     Check if file path matches any user-specified skip pattern.
     """
-    if not patterns:
+    if pattern_re is None:
+        return False
+    return pattern_re.match(os.path.normcase(file)) is not None
+
+def should_keep_file(file: str, pattern_re: re.Pattern | None) -> bool:
+    """
+    Check if file path matches any user-specified keep pattern.
+    """
+    if pattern_re is None:
         return True
-    return any(fnmatch.fnmatch(file, pat) for pat in patterns)
+    return pattern_re.match(os.path.normcase(file)) is not None
 
 # Language mapping for syntax highlighting
 lang_map = {
@@ -137,10 +156,14 @@ def detect_language(file_path: Path) -> str:
 def export_git_project_to_markdown(repo_dir: Path, output_file: Path,
                                    extensions=None, include_index=True,
                                    binary_skip=False, preserve_newline=False,
-                                   keep_patterns=None, skip_patterns=None):
+                                   keep_patterns=None, skip_patterns=None,
+                                   max_workers=8):
     files = get_git_files(repo_dir)
+    keep_re = compile_patterns(keep_patterns)
+    skip_re = compile_patterns(skip_patterns)
 
-    with output_file.open("w", encoding="utf-8", newline="\n") as out:
+    # Each exported file is one out.write(), a 1 MiB buffer batches them into few syscalls
+    with output_file.open("w", encoding="utf-8", newline="\n", buffering=1 << 20) as out:
         out.write("# Project Export (Git tracked + untracked files)\n\n")
 
         # Index section
@@ -149,52 +172,69 @@ def export_git_project_to_markdown(repo_dir: Path, output_file: Path,
             for file in files:
                 if extensions and not any(file.endswith(ext) for ext in extensions):
                     continue
-                if should_skip_file(file, skip_patterns):
+                if should_skip_file(file, skip_re):
                     continue
-                if not should_keep_file(file, keep_patterns):
+                if not should_keep_file(file, keep_re):
                     continue
                 out.write(f"- {file}\n")
             out.write("\n---\n\n")
 
         # Export each file
-        for file in files:
+        # Files are read and wrapped on a thread pool (I/O bound, independent
+        # per file), results are consumed in input order so output is stable.
+        # Returns (markdown, message), either may be None.
+        def load_one(file: str) -> tuple[str | None, str | None]:
             if extensions and not any(file.endswith(ext) for ext in extensions):
-                continue
-            if not should_keep_file(file, keep_patterns):
-                print(f"Skipped by keep pattern: {file}")
-                continue
-            if should_skip_file(file, skip_patterns):
-                print(f"Skipped by skip pattern: {file}")
-                continue
+                return None, None
+            if not should_keep_file(file, keep_re):
+                return None, f"Skipped by keep pattern: {file}"
+            if should_skip_file(file, skip_re):
+                return None, f"Skipped by skip pattern: {file}"
 
             display_path = file  # keep Unix style for Markdown
             file_path = repo_dir / Path(file)
 
-            if binary_skip and is_binary_file(file_path):
-                print(f"Skipped binary file: {file_path}")
-                continue
+            try:
+                # One open + read, the binary check and decoding share the bytes
+                with file_path.open("rb") as f:
+                    raw = f.read()
+            except Exception as e:
+                if binary_skip:
+                    return None, f"Skipped binary file: {file_path}"
+                return None, f"Skipped {file_path}: {e}"
+
+            if binary_skip and is_binary_content(raw):
+                return None, f"Skipped binary file: {file_path}"
 
             try:
-                size = file_path.stat().st_size
-                newline_mode = None if preserve_newline else ""
-                with file_path.open("r", encoding="utf-8", errors="replace", newline=newline_mode) as f:
-                    lines = f.readlines()
-                content = "".join(lines)
-                line_count = len(lines)
-
-                # Metadata
-                out.write(f"## FILE: {display_path}\n")
-                out.write(f"- Size: {size} bytes\n")
-                out.write(f"- Lines: {line_count}\n\n")
+                size = len(raw)
+                content = raw.decode("utf-8", errors="replace")
+                if preserve_newline:
+                    # Same as reading in text mode with universal newlines
+                    content = content.replace("\r\n", "\n").replace("\r", "\n")
+                line_count = count_lines(content)
 
                 # Language detection
                 language = detect_language(file_path)
 
-                # Code block
-                out.write(safe_backtick_wrapper(content, language))
-                out.write("\n\n")
+                return (
+                    # Metadata
+                    f"## FILE: {display_path}\n"
+                    f"- Size: {size} bytes\n"
+                    f"- Lines: {line_count}\n\n"
+                    # Code block
+                    + safe_backtick_wrapper(content, language)
+                    + "\n\n"
+                ), None
             except Exception as e:
-                print(f"Skipped {file_path}: {e}")
+                return None, f"Skipped {file_path}: {e}"
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for markdown, message in executor.map(load_one, files):
+                if message is not None:
+                    print(message)
+                if markdown is not None:
+                    out.write(markdown)
 
 def main():
     parser = argparse.ArgumentParser(
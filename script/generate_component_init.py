@@ -33,8 +33,13 @@ def load_module(path: pathlib.Path):
     spec.loader.exec_module(module)
     return module
 
-def collect_component_classes():
-    main_classes, config_classes, runtime_classes = [], [], []
+def collect_component_files():
+    """
+    Load each component module once.
+    Returns [(py_file, classes_in_file)], classes_in_file are class names
+    starting with the component prefix, e.g. HtmlIndexer*.
+    """
+    component_files = []
 
     for py_file in COMPONENT_DIR.glob("_*.py"):
         if not py_file.name.endswith(".py") or py_file.name.startswith("__"):
@@ -43,9 +48,19 @@ def collect_component_classes():
         prefix = py_file.stem[1:]  # _HtmlIndexer.py -> HtmlIndexer
         module = load_module(py_file)
 
-        for name, obj in inspect.getmembers(module, inspect.isclass):
-            if not name.startswith(prefix):
-                continue  # 只抓對應 prefix 的 class
+        classes_in_file = [
+            name for name, obj in inspect.getmembers(module, inspect.isclass)
+            if name.startswith(prefix)  # 只抓對應 prefix 的 class
+        ]
+        component_files.append((py_file, classes_in_file))
+
+    return component_files
+
+def collect_component_classes(component_files):
+    main_classes, config_classes, runtime_classes = [], [], []
+
+    for py_file, classes_in_file in component_files:
+        for name in classes_in_file:
             if name.endswith("Config"):
                 config_classes.append(name)
             elif name.endswith("Runtime"):
@@ -75,20 +90,12 @@ def format_union(name, classes, annotated=False):
         lines.append(f"]")
     return "\n".join(lines)
 
-def generate_text(main_classes, config_classes, runtime_classes, component_name):
+def generate_text(component_files, main_classes, config_classes, runtime_classes, component_name):
     component_upper = component_name.capitalize()
     lines = []
 
     # imports
-    for py_file in COMPONENT_DIR.glob("_*.py"):
-        if not py_file.name.endswith(".py") or py_file.name.startswith("__"):
-            continue
-        prefix = py_file.stem[1:]
-        module = load_module(py_file)
-        classes_in_file = [
-            name for name, obj in inspect.getmembers(module, inspect.isclass)
-            if name.startswith(prefix)
-        ]
+    for py_file, classes_in_file in component_files:
         if classes_in_file:
             lines.append(f"from .{py_file.stem} import (")
             for cls in classes_in_file:
@@ -120,8 +127,9 @@ def generate_text(main_classes, config_classes, runtime_classes, component_name)
 # ---------- Main ----------
 def main():
     component_name = COMPONENT_DIR.name
-    main_classes, config_classes, runtime_classes = collect_component_classes()
-    text = generate_text(main_classes, config_classes, runtime_classes, component_name)
+    component_files = collect_component_files()
+    main_classes, config_classes, runtime_classes = collect_component_classes(component_files)
+    text = generate_text(component_files, main_classes, config_classes, runtime_classes, component_name)
 
     if OUTPUT_PATH:
         OUTPUT_PATH.write_text(text)
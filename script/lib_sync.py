@@ -11,6 +11,8 @@ import sys
 import tempfile
 from pathlib import Path
 
+from _jsonc import load_jsonc
+
 class CustomEncoder(json.JSONEncoder):
     def default(self, obj):
         # Example: Keep lists short on one line if they fit
@@ -18,40 +20,20 @@ class CustomEncoder(json.JSONEncoder):
             return json.JSONEncoder.default(self, obj)
         return super().default(obj)
 
-def sha256_of_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-def load_jsonc(path: Path) -> dict:
+def copy_and_hash(src: Path, dst: Path, chunk_size: int = 1 << 20) -> tuple[int, str]:
     """
-    Very simple JSONC loader:
-    - strips // line comments
-    - strips /* */ block comments
+    Copy src to dst (with metadata, like shutil.copy2) and compute size and
+    sha256 of the copied bytes in the same pass, no second read of dst.
     """
-    text = path.read_text(encoding="utf-8")
-    lines = []
-    in_block = False
-
-    for line in text.splitlines():
-        stripped = line.strip()
-
-        if stripped.startswith("/*"):
-            in_block = True
-            continue
-        if stripped.endswith("*/"):
-            in_block = False
-            continue
-        if in_block:
-            continue
-        if stripped.startswith("//"):
-            continue
-
-        lines.append(line)
-
-    return json.loads("\n".join(lines))
+    h = hashlib.sha256()
+    size = 0
+    with src.open("rb") as rf, dst.open("wb") as wf:
+        while buf := rf.read(chunk_size):
+            h.update(buf)
+            wf.write(buf)
+            size += len(buf)
+    shutil.copystat(src, dst)
+    return size, h.hexdigest()
 
 
 def run(cmd: list[str], cwd: Path | None = None, capture_output:bool = False):
@@ -65,6 +47,28 @@ def run(cmd: list[str], cwd: Path | None = None, capture_output:bool = False):
     return result.stdout if capture_output else None
 
 
+def clone_tag(repo: str, tag: str, dst: Path, paths: list[str]):
+    """
+    Clone only the blobs of `paths` at `tag` into `dst`.
+
+    Uses a shallow, blob-less, sparse clone so only the listed files are
+    fetched. Falls back to a full single-branch clone if the git client or
+    the remote doesn't support partial clone / sparse checkout.
+    """
+    try:
+        run(["git", "-c", "advice.detachedHead=false", "clone",
+             "--depth=1", "--filter=blob:none", "--sparse", "--no-checkout",
+             "--branch", tag, "--single-branch", repo, dst])
+        # non-cone mode, entries are file paths rather than directories
+        run(["git", "sparse-checkout", "set", "--no-cone", "--", *paths], cwd=dst)
+        run(["git", "-c", "advice.detachedHead=false", "checkout", "--quiet"], cwd=dst)
+    except subprocess.CalledProcessError:
+        print("[WARN] Sparse clone failed, falling back to full clone")
+        shutil.rmtree(dst, ignore_errors=True)
+        dst.mkdir(parents=True, exist_ok=True)
+        run(["git", "-c", "advice.detachedHead=false", "clone", "--branch", tag, "--single-branch", repo, dst])
+
+
 def sync_lib(libinfo_path: Path):
     original_libinfo_path = libinfo_path
     libinfo_path = libinfo_path.resolve()
@@ -95,7 +99,7 @@ def sync_lib(libinfo_path: Path):
 
         print(f"[INFO] Cloning {repo} to {repr(tmp.as_posix())}")
         print(f"[INFO] Checking out tag {tag}")
-        run(["git", "-c", "advice.detachedHead=false", "clone", "--branch", tag, "--single-branch", repo, tmp])
+        clone_tag(repo, tag, tmp, [entry["from"] for entry in files])
 
         print(f"[INFO] Getting commit rev on tag {tag}")
         # output: bytearray = run(["git", "rev-parse", tag], cwd=tmp, capture_output=True)
@@ -113,11 +117,8 @@ def sync_lib(libinfo_path: Path):
 
             print(f"[SYNC] {entry['from']} -> {entry['to']}")
             dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-
-            # integrity check
-            size = dst.stat().st_size
-            sha256 = sha256_of_file(dst)
+            # integrity check, computed while copying
+            size, sha256 = copy_and_hash(src, dst)
 
             new_entry = {
                 'from': entry['from'],
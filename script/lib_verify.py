@@ -1,65 +1,51 @@
-import json
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def load_jsonc(path: Path) -> dict:
-    """
-    Very simple JSONC loader:
-    - strips // line comments
-    - strips /* */ block comments
-    """
-    text = path.read_text(encoding="utf-8")
-    lines = []
-    in_block = False
-
-    for line in text.splitlines():
-        stripped = line.strip()
-
-        if stripped.startswith("/*"):
-            in_block = True
-            continue
-        if stripped.endswith("*/"):
-            in_block = False
-            continue
-        if in_block:
-            continue
-        if stripped.startswith("//"):
-            continue
-
-        lines.append(line)
-
-    return json.loads("\n".join(lines))
+from _jsonc import load_jsonc
 
 
 def sha256_of_file(path: Path) -> str:
-    h = hashlib.sha256()
+    # file_digest() reads in C with a large buffer, GIL released while hashing
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def inspect_file(file_path: Path) -> tuple[int, str] | None:
+    """
+    Return (size, sha256) of the file, None if missing.
+    """
+    try:
+        size = file_path.stat().st_size
+    except FileNotFoundError:
+        return None
+    return size, sha256_of_file(file_path)
 
 
 def verify_libinfo(libinfo_path: Path) -> None:
     base_dir = libinfo_path.parent
     info = load_jsonc(libinfo_path)
+    entries = info.get("files", [])
+
+    # Hash concurrently (hashlib releases the GIL), report in input order
+    file_paths = [base_dir / entry["to"] for entry in entries]
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(entries)))) as executor:
+        inspections = list(executor.map(inspect_file, file_paths))
 
     errors = 0
 
-    for entry in info.get("files", []):
-        rel = entry["to"]
+    for entry, file_path, inspection in zip(entries, file_paths, inspections):
         expected_size = entry.get("size")
         expected_sha256 = entry.get("sha256")
 
-        file_path = base_dir / rel
-
         print(f"Checking: {file_path}")
 
-        if not file_path.exists():
+        if inspection is None:
             print(f"  ❌ MISSING file")
             errors += 1
             continue
 
-        actual_size = file_path.stat().st_size
+        actual_size, actual_sha256 = inspection
         if expected_size is None: 
             print("  ❌ MISSING size")
             errors += 1
@@ -73,7 +59,6 @@ def verify_libinfo(libinfo_path: Path) -> None:
             print("  ❌ MISSING sha256")
             errors += 1
         else:
-            actual_sha256 = sha256_of_file(file_path)
             if actual_sha256.lower() != expected_sha256.lower():
                 print(f"  ❌ SHA256 mismatch")
                 print(f"     expected: {expected_sha256}")
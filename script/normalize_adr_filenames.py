@@ -10,7 +10,12 @@ from typing import List
 # Title normalization logic
 # ----------------------------
 
-ACRONYM_RE = re.compile(r"[A-Z]{2,}")
+# One pass tokenizer, alternatives tried in order:
+# - acronym, greedy (SQL in SQLite, giving sql-ite as in existing ADR names)
+# - capitalized word (Parser)
+# - lowercase / digit run (0001, foo)
+# Anything else (spaces, punctuation, "_") separates tokens.
+TOKEN_RE = re.compile(r"[A-Z]{2,}|[A-Z][^\W_A-Z]*|[^\W_A-Z]+")
 
 def split_camel_and_acronyms(text: str) -> List[str]:
     """
@@ -18,50 +23,15 @@ def split_camel_and_acronyms(text: str) -> List[str]:
     - Preserve acronyms (HTML, URL)
     - Split CamelCase words
     """
-    tokens = []
-    buf = ""
-
-    i = 0
-    while i < len(text):
-        # Acronym
-        m = ACRONYM_RE.match(text, i)
-        if m:
-            if buf:
-                tokens.append(buf)
-                buf = ""
-            tokens.append(m.group())
-            i = m.end()
-            continue
-
-        c = text[i]
-        if c.isupper():
-            if buf and not buf[-1].isupper():
-                tokens.append(buf)
-                buf = c
-            else:
-                buf += c
-        elif c.isalnum():
-            buf += c
-        else:
-            if buf:
-                tokens.append(buf)
-                buf = ""
-        i += 1
-
-    if buf:
-        tokens.append(buf)
-
-    return tokens
+    return TOKEN_RE.findall(text)
 
 
 def normalize_title(title: str) -> str | None:
     """
     Normalize title into kebab-case according to ADR-0009
     """
-    words: List[str] = []
-
-    for part in re.split(r"\s+", title.strip()):
-        words.extend(split_camel_and_acronyms(part))
+    # Whitespace separates tokens too, tokenize the whole title at once
+    words: List[str] = split_camel_and_acronyms(title)
 
     if len(words) < 2 or words[0].lower() != 'adr' or not words[1].isdigit():
         return None
@@ -1,81 +1,180 @@
 import logging
-import pathlib
 import os
-import glob
 import datetime
 import argparse
+import hashlib
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pkms.core.utility import (
     get_file_content,
     index_html_file,
     parse_singlefile_html_metadata,
-    get_content_hash_sha256_string,
 )
 
+_TRUE_STRS = frozenset(('yes', 'true', 't', 'y', '1'))
+_FALSE_STRS = frozenset(('no', 'false', 'f', 'n', '0', 'nil', 'null'))
+
 def str2bool(v):
     if isinstance(v, bool):
         return v
-    if v.lower() in ('yes', 'true', 't', 'y', '1'):
+    s = v.lower()
+    if s in _TRUE_STRS:
         return True
-    elif v.lower() in ('no', 'false', 'f', 'n', '0', 'nil', 'null'):
+    elif s in _FALSE_STRS:
         return False
     else:
         raise argparse.ArgumentTypeError('Boolean value expected.')
 
-def rename_html_files(base_path, dry_run=True):
+# Same as name_prefix[:4].isdigit(), without slicing: four leading digits,
+# or a shorter prefix made of digits only
+_DIGITS4_RE = re.compile(r'\d{4}|\d{1,3}\Z')
+# Already normalized, e.g. 2024-01-01-821a1684
+_PREFIX_RE = re.compile(r'\d{4}-\d{2}-\d{2}-[0-9a-f]{8}')
+
+def sha256_file(file_path):
+    # Stream the raw bytes into the hash, no full-size copy of the
+    # (possibly huge) SingleFile archive is made for hashing
+    with open(file_path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+def scan_html_entries(base_path):
+    # Same selection as glob('*.html'), directly from one scandir pass
+    with os.scandir(base_path) as it:
+        return [
+            entry for entry in it
+            if entry.name.endswith('.html') and not entry.name.startswith('.') and entry.is_file()
+        ]
+
+# Sidecar cache in the html directory, file name -> [size, mtime_ns, sha256]
+HASH_CACHE_FILE_NAME = '.pkms-index.json'
+
+def load_hash_cache(base_path):
+    try:
+        with open(os.path.join(base_path, HASH_CACHE_FILE_NAME), 'rb') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def save_hash_cache(base_path, cache):
+    cache_path = os.path.join(base_path, HASH_CACHE_FILE_NAME)
+    # Write then rename, an interrupted run never leaves a partial cache
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, cache_path)
+
+def compute_new_file_prefix(file_path, file_hash_sha256=None):
+    """
+    Index, hash and parse one html file, return
+    (index, new_file_prefix, file_hash_sha256). A known hash is reused.
+    Runs in a worker process.
+    """
+    index = index_html_file(file_path)
+    if file_hash_sha256 is None:
+        file_hash_sha256 = sha256_file(file_path)
+    content = get_file_content(file_path)
+
+    sf_metadata = parse_singlefile_html_metadata(content)
+    if isinstance(sf_metadata,dict) and 'saved_date' in sf_metadata:
+        saved_datetime = datetime.datetime.fromisoformat(sf_metadata['saved_date'])
+    else:
+        saved_datetime = datetime.datetime.fromtimestamp(os.stat(file_path).st_ctime)
+    saved_date = saved_datetime.date().isoformat()
+    new_file_prefix = saved_date + '-' + file_hash_sha256[0:8]
+    return index, new_file_prefix, file_hash_sha256
+
+def rename_html_files(base_path, dry_run=True, force=False, max_workers=None):
     # This Script normalize the webpages html files in the specified directory
     # e.g. base_path = "/path/to/resource/webpages"
-    sub_pathes = glob.glob('*.html', root_dir=base_path, recursive=False)
+    entries = scan_html_entries(base_path)
+    hash_cache = load_hash_cache(base_path)
+    new_hash_cache = {}
 
     # f = open('input-names.txt', 'w', newline='\n', encoding='utf-8')
-    # for sub_path in sub_pathes:
-    #     f.write(sub_path+'\n')
-
-    for sub_path in sub_pathes:
-        base_path_ = pathlib.Path(base_path)
-        file_path = base_path_ / sub_path
-        # print(str(file_path))
-        # print(file_path.name)
-        name_split = file_path.name.split()
+    # for entry in entries:
+    #     f.write(entry.name+'\n')
+
+    jobs = []
+    for entry in entries:
+        file_path = entry.path
+        file_name = entry.name
+        # print(file_path)
+        # print(file_name)
+        name_split = file_name.split()
         name_prefix = name_split[0]
-        if name_prefix[:4].isdigit():
-            index = file_path.name.find(' ')
-            name_non_prefix = file_path.name[index:].strip()
+        if _DIGITS4_RE.match(name_prefix):
+            index = file_name.find(' ')
+            name_non_prefix = file_name[index:].strip()
         else:
             name_prefix = ''
-            name_non_prefix = file_path.name
-        index = index_html_file(file_path)
-        print(index)
-        content = get_file_content(file_path)
-        file_hash_sha256 = get_content_hash_sha256_string(content)
-
-        sf_metadata = parse_singlefile_html_metadata(content)
-        if isinstance(sf_metadata,dict) and 'saved_date' in sf_metadata:
-            saved_datetime = datetime.datetime.fromisoformat(sf_metadata['saved_date'])
-        else:
-            saved_datetime = datetime.datetime.fromtimestamp(file_path.stat().st_ctime)
-        saved_date = saved_datetime.date().isoformat()
-        new_file_prefix = saved_date + '-' + file_hash_sha256[0:8]
-        is_same = '1' if new_file_prefix == name_prefix else '0'
-        logging.info('rename {}: {} -> {} ;'.format(is_same, name_prefix, new_file_prefix))
-        new_file_name = ' '.join([new_file_prefix, name_non_prefix])
-        new_file_path = file_path.parent / new_file_name
-        try:
-            if file_path == new_file_path:
-                logging.info(f"skip rename to same file='{file_path}'")
-            print(f"mv '{file_path}' '{new_file_path}'")
-            if not dry_run:
-                os.rename(file_path, new_file_path)
-        except FileNotFoundError:
-            logging.error(f"Error: The file '{file_path}' was not found.")
-        except FileExistsError:
-            logging.error(f"Error: The file '{file_path}' already exists.")
-        except PermissionError:
-            logging.error("Error: Permission denied. Unable to rename the file.")
-        except OSError as e:
-            logging.error(f"An unexpected OS error occurred: {e}")
+            name_non_prefix = file_name
+        if not force and _PREFIX_RE.fullmatch(name_prefix):
+            # Incremental pass, trust the existing prefix instead of
+            # re-hashing and re-parsing the whole file
+            logging.info(f"skip already normalized file='{file_path}'")
+            if file_name in hash_cache:
+                new_hash_cache[file_name] = hash_cache[file_name]
+            continue
+        # Unchanged size and mtime, reuse the hash from the previous run
+        st = entry.stat()
+        file_hash_sha256 = None
+        match hash_cache.get(file_name):
+            case [st.st_size, st.st_mtime_ns, str(cached_sha256)]:
+                file_hash_sha256 = cached_sha256
+        jobs.append((file_path, file_name, name_prefix, name_non_prefix, st, file_hash_sha256))
+
+    # All renames happen inside base_path, rename leaf names relative to one
+    # opened directory fd instead of resolving both full paths every time
+    dir_fd = None
+    if not dry_run and os.rename in os.supports_dir_fd:
+        dir_fd = os.open(base_path, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+
+    # Hashing and parsing are cpu bound and independent per file, they run
+    # on a process pool. Results come back in order, renames stay serial.
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            results = executor.map(
+                compute_new_file_prefix,
+                [job[0] for job in jobs],
+                [job[5] for job in jobs],
+                chunksize=32,
+            )
+            for (file_path, file_name, name_prefix, name_non_prefix, st, _), (index, new_file_prefix, file_hash_sha256) in zip(jobs, results):
+                print(index)
+                is_same = '1' if new_file_prefix == name_prefix else '0'
+                logging.info('rename {}: {} -> {} ;'.format(is_same, name_prefix, new_file_prefix))
+                new_file_name = ' '.join([new_file_prefix, name_non_prefix])
+                new_file_path = os.path.join(base_path, new_file_name)
+                cached_file_name = file_name
+                try:
+                    if file_path == new_file_path:
+                        logging.info(f"skip rename to same file='{file_path}'")
+                    print(f"mv '{file_path}' '{new_file_path}'")
+                    if dir_fd is not None:
+                        os.rename(file_name, new_file_name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+                        cached_file_name = new_file_name
+                    elif not dry_run:
+                        os.rename(file_path, new_file_path)
+                        cached_file_name = new_file_name
+                except FileNotFoundError:
+                    logging.error(f"Error: The file '{file_path}' was not found.")
+                except FileExistsError:
+                    logging.error(f"Error: The file '{file_path}' already exists.")
+                except PermissionError:
+                    logging.error("Error: Permission denied. Unable to rename the file.")
+                except OSError as e:
+                    logging.error(f"An unexpected OS error occurred: {e}")
+                # rename keeps size and mtime, the entry follows the new name
+                new_hash_cache[cached_file_name] = [st.st_size, st.st_mtime_ns, file_hash_sha256]
+        if not dry_run:
+            save_hash_cache(base_path, new_hash_cache)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
 
 def parse_args():
-    parser = argparse.ArgumentParser(description='A simple example of parsing options.')
     log_levels = ['NOTSET', 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
     parser = argparse.ArgumentParser(description="An example script demonstrating logging with argparse.")
     parser.add_argument(
@@ -86,6 +185,7 @@ def parse_args():
     )
     parser.add_argument('--dir-path', help='The path of the html file dirs to process')
     parser.add_argument('--dry-run', help='Just print instead of renaming the files',default=True, const=True, nargs='?', type=str2bool)
+    parser.add_argument('--force', help='Recompute the prefix of already normalized files as well',default=False, const=True, nargs='?', type=str2bool)
     args = parser.parse_args()
     logging.basicConfig(level=args.log_level, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -93,12 +193,13 @@ def parse_args():
     logging.info(f"dir_path: {args.dir_path}")
     logging.info(f"log_level: {args.log_level}")
     logging.info(f"dry_run: {args.dry_run}")
+    logging.info(f"force: {args.force}")
     return args
 
 def main():
     args = parse_args()
     print(args)
-    rename_html_files(base_path=args.dir_path, dry_run=args.dry_run)
+    rename_html_files(base_path=args.dir_path, dry_run=args.dry_run, force=args.force)
 
 if __name__ == '__main__':
     main()
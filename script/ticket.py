@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 import argparse
+import functools
+import shutil
 import subprocess
 import sys
 import os
 from datetime import datetime, timezone
 import pathlib
-import time
 import re
 import json
 
@@ -29,15 +30,26 @@ def find_sync_files(worktree):
 
 # ---------- helpers ----------
 
+@functools.lru_cache(maxsize=None)
+def which(program):
+    # PATH lookup once per program, not in every spawned child
+    return shutil.which(program)
+
+def git_cmd(worktree, *args):
+    # git changes into the worktree itself, the child needs no cwd
+    return ["git", "-C", worktree, *args]
+
 def run(cmd, cwd=None, allow_fail=False, capture=False):
     cmd_strs = [ repr(c) if ' ' in c else c for c in cmd]
     print(f"$ {' '.join(cmd_strs)}")
+    # subprocess already launches via vfork/posix_spawn where available
+    executable = which(cmd[0])
     if capture:
-        result = subprocess.run(cmd, cwd=cwd, text=True,
+        result = subprocess.run(cmd, cwd=cwd, text=True, executable=executable,
                               stdout=subprocess.PIPE,
                               stderr=subprocess.PIPE)
     else:
-        result = subprocess.run(cmd, cwd=cwd)
+        result = subprocess.run(cmd, cwd=cwd, executable=executable)
     if result.returncode != 0 and not allow_fail:
         raise RuntimeError(f"command failed: {' '.join(cmd)}")
     return result
@@ -60,10 +72,10 @@ def check_worktree(path):
     ok(f"worktree exists: {path}")
 
 
+@functools.lru_cache(maxsize=8)
 def get_branch(path):
     res = run(
-        ["git", "branch", "--show-current"],
-        cwd=path,
+        git_cmd(path, "branch", "--show-current"),
         capture=True
     )
     if res.returncode != 0:
@@ -71,6 +83,28 @@ def get_branch(path):
     return res.stdout.strip()
 
 
+def get_status(path, pathspec):
+    """
+    Current branch and whether `pathspec` has changes, from one git call.
+    """
+    res = run(
+        git_cmd(path, "status", "--porcelain=v2", "--branch", "--", pathspec),
+        capture=True
+    )
+    if res.returncode != 0:
+        abort("failed to detect worktree status")
+    branch = ''
+    modified = False
+    for line in res.stdout.splitlines():
+        if line.startswith("# branch.head "):
+            head = line[len("# branch.head "):].strip()
+            # same as `git branch --show-current`, empty when detached
+            branch = '' if head == "(detached)" else head
+        elif line and not line.startswith("#"):
+            modified = True
+    return branch, modified
+
+
 def check_branch(path, expected):
     current = get_branch(path)
     if current != expected:
@@ -80,27 +114,34 @@ def check_branch(path, expected):
 
 # ---------- status ----------
 
-def stat_issues_jsonl(worktree, rel):
-    path = os.path.join(worktree, rel)
-    if os.name == 'nt':
-        path = path.replace('\\','/')
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def format_timestamp(ts):
+    return datetime.fromtimestamp(ts).strftime(TIMESTAMP_FORMAT)
 
-    if not os.path.isfile(path):
+def scan_beads_dir(worktree):
+    """
+    DirEntry of each file directly under `<worktree>/.beads`, keyed by its
+    `.beads/<name>` relative path, from one directory read.
+    """
+    try:
+        with os.scandir(os.path.join(worktree, '.beads')) as it:
+            return {f".beads/{entry.name}": entry for entry in it if entry.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+def stat_issues_jsonl(rel, entry):
+    if entry is None:
         print(f"- {rel}: MISSING")
-        # print(f"    path : {path!r}")
         return
 
-    st = os.stat(path)
-
-    def fmt(ts):
-        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+    st = entry.stat()
 
     print(f"- {rel}: EXISTS")
-    # print(f"    path : {path!r}")
     print(f"    size : {st.st_size} bytes")
-    print(f"    ctime: {fmt(st.st_ctime)}")
-    print(f"    mtime: {fmt(st.st_mtime)}")
-    print(f"    atime: {fmt(st.st_atime)}")
+    print(f"    ctime: {format_timestamp(st.st_ctime)}")
+    print(f"    mtime: {format_timestamp(st.st_mtime)}")
+    print(f"    atime: {format_timestamp(st.st_atime)}")
 
 def do_status(remote, branch, worktree):
     print("=== status ===")
@@ -113,7 +154,8 @@ def do_status(remote, branch, worktree):
 
     print('')
 
-    current = get_branch(worktree)
+    # branch and git staged / unstaged JSONL
+    current, modified = get_status(worktree, ".beads")
     if current == branch:
         print(f"- branch:   OK ({branch})")
     else:
@@ -121,13 +163,7 @@ def do_status(remote, branch, worktree):
 
     print('')
 
-    # git staged / unstaged JSONL
-    res = run(
-        ["git", "status", "--porcelain", ".beads"],
-        cwd=worktree,
-        capture=True
-    )
-    if res.stdout.strip():
+    if modified:
         print("- jsonl:    MODIFIED (pending commit)")
     else:
         print("- jsonl:    CLEAN")
@@ -143,17 +179,9 @@ def do_status(remote, branch, worktree):
 
     print('')
 
-    pathlib.Path(worktree)/ '.beads' / 'issue'
-    if not os.path.isdir(worktree):
-        print(f"- worktree: MISSING ({worktree})")
-        return
-
-    print(f"- worktree: OK ({worktree})")
-
-    print('')
-
+    entries = scan_beads_dir(worktree)
     for file in SYNC_FILES:
-        stat_issues_jsonl(worktree, file)
+        stat_issues_jsonl(file, entries.get(file))
         print('')
 
     print("=== end status ===")
@@ -168,7 +196,7 @@ def get_beads_version() -> str | None:
 
 def get_worktree_head_commit_id(worktree) -> str | None:
     commit = None
-    command_result = run(["git", "rev-parse", "HEAD"], cwd=worktree, allow_fail=True, capture=True)
+    command_result = run(git_cmd(worktree, "rev-parse", "HEAD"), allow_fail=True, capture=True)
     if command_result.returncode == 0:
         commit = command_result.stdout.strip()
     return commit
@@ -188,7 +216,7 @@ def do_pull(remote, branch, worktree):
     if issues_jsonl_path.exists():
         os.replace(issues_jsonl_path, left_jsonl_path)
     # checkout HEAD issues.jsonl
-    run(['git', 'checkout', '--', issues_jsonl_relative_path], cwd=worktree, allow_fail=True)
+    run(git_cmd(worktree, 'checkout', '--', issues_jsonl_relative_path), allow_fail=True)
     # save metadata
     metadata = {
         'version': get_beads_version(),
@@ -197,7 +225,7 @@ def do_pull(remote, branch, worktree):
     }
     with open(left_meta_json_path, "w", newline='\n') as json_file:
         json.dump(metadata, json_file)
-    run(["git", "pull", "--rebase", remote, branch], cwd=worktree)
+    run(git_cmd(worktree, "pull", "--rebase", remote, branch))
     run(["bd", "import", "-i", issues_jsonl_relative_path, "--protect-left-snapshot"], cwd=worktree)
     ok("pull completed")
 
@@ -208,11 +236,11 @@ def do_push(remote, branch, worktree):
 
     sync_files = find_sync_files(worktree=worktree)
 
-    run(["git", "add", "--"] + sync_files, cwd=worktree)
+    run(git_cmd(worktree, "add", "--") + sync_files)
 
     diff = subprocess.run(
-        ["git", "diff", "--cached", "--quiet", "--"] + sync_files,
-        cwd=worktree
+        git_cmd(worktree, "diff", "--cached", "--quiet", "--") + sync_files,
+        executable=which("git"),
     )
 
     if diff.returncode == 0:
@@ -220,15 +248,14 @@ def do_push(remote, branch, worktree):
         return
 
     msg = f"ticket(sync): {datetime.now(timezone.utc).astimezone().isoformat()}"
-    run(["git", "commit", "-m", msg], cwd=worktree)
-    run(["git", "push", remote, branch], cwd=worktree)
+    run(git_cmd(worktree, "commit", "-m", msg))
+    run(git_cmd(worktree, "push", remote, branch))
     ok("push completed")
 
 def ensure_clean_history(remote, branch, worktree):
     print("# Ensure clean worktree history")
     r = run(
-        ["git", "log", f"{remote}/{branch}..HEAD", "--oneline", "--no-decorate", "--no-abbrev-commit"],
-        cwd=worktree,
+        git_cmd(worktree, "log", f"{remote}/{branch}..HEAD", "--oneline", "--no-decorate", "--no-abbrev-commit"),
         capture=True,
         allow_fail=True,
     )
@@ -240,7 +267,7 @@ def ensure_clean_history(remote, branch, worktree):
     if len(lines) == 1 and lines[0].split(' ', 1)[1].startswith("ticket(sync):"):
         rev = lines[0].split(' ', 1)[0]
         print("# Found unpushed ticket(sync) commit, dropping it.")
-        run(["git", "reset", "--mixed", f"{rev}~1"], cwd=worktree)
+        run(git_cmd(worktree, "reset", "--mixed", f"{rev}~1"))
         ok("Dropped unpushed ticket(sync) commit successfully")
     elif lines:
         raise RuntimeError(
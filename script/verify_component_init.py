@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 import pathlib
 import ast
+import functools
 import importlib.util
-import inspect
 import argparse
 
 # ---------- CLI ----------
@@ -19,7 +19,12 @@ COMPONENT_DIR = args.component_dir
 
 # ---------- Helpers ----------
 def load_module(path: pathlib.Path):
-    spec = importlib.util.spec_from_file_location(path.stem, path)
+    return _load_module(str(path.resolve()))
+
+@functools.lru_cache(maxsize=None)
+def _load_module(path: str):
+    # exec each file once, keyed by its resolved path
+    spec = importlib.util.spec_from_file_location(pathlib.Path(path).stem, path)
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
     return module
@@ -34,8 +39,8 @@ def collect_component_classes():
         prefix = py_file.stem[1:]  # _HtmlIndexer.py -> HtmlIndexer
         module = load_module(py_file)
 
-        for name, obj in inspect.getmembers(module, inspect.isclass):
-            if not name.startswith(prefix):
+        for name, obj in vars(module).items():
+            if not isinstance(obj, type) or not name.startswith(prefix):
                 continue  # 只抓對應 prefix 的 class
             if name.endswith("Config"):
                 config_classes.append(name)
@@ -50,24 +55,25 @@ def parse_init(init_path: pathlib.Path):
     """解析 __init__.py，回傳 imported class, __all__, union assignments"""
     if not init_path.exists():
         return set(), set(), {}
-    with init_path.open() as f:
-        tree = ast.parse(f.read(), filename=str(init_path))
+    # bytes, ast.parse decodes by the source's own encoding rules
+    tree = ast.parse(init_path.read_bytes(), filename=str(init_path))
 
     imported, all_list, union_assigns = set(), set(), {}
     for node in tree.body:
-        if isinstance(node, ast.ImportFrom):
-            for n in node.names:
-                imported.add(n.name)
-        if isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    if target.id == "__all__" and isinstance(node.value, (ast.List, ast.Tuple)):
-                        for elt in node.value.elts:
-                            if isinstance(elt, ast.Constant) and isinstance(elt.value, str):
-                                all_list.add(elt.value)
-                    else:
-                        # 假設 union 也是 Assign
-                        union_assigns[target.id] = node.value
+        match node:
+            case ast.ImportFrom(names=names):
+                imported.update(n.name for n in names)
+            case ast.Assign(targets=targets, value=value):
+                for target in targets:
+                    match target, value:
+                        case ast.Name(id="__all__"), ast.List(elts=elts) | ast.Tuple(elts=elts):
+                            all_list.update(
+                                elt.value for elt in elts
+                                if isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+                            )
+                        case ast.Name(id=name), _:
+                            # 假設 union 也是 Assign
+                            union_assigns[name] = value
     return imported, all_list, union_assigns
 
 def extract_union_classes(node):
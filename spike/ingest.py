@@ -3,8 +3,19 @@ from pkms.component.indexer import HtmlIndexer
 from pkms.component.upserter import Sqlite3Upserter
 from pkms.component.screener import SimpleScreener
 from pkms.core.model import ScreeningStatus
+from pkms.core.utility import load_jsonc
 
-import commentjson as json
+import itertools
+import os
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+INDEX_MAX_WORKERS = os.cpu_count() or 1
+# files screened/indexed ahead of the writer
+INDEX_QUEUE_SIZE = 64
+# documents per upsert transaction
+UPSERT_BATCH_SIZE = 100
 
 def ingest_html_collection(collection_path, db_path, dry_run):
     globber_config = PathspecGlobber.Config(
@@ -25,42 +36,64 @@ def ingest_html_collection(collection_path, db_path, dry_run):
     upserter = Sqlite3Upserter(config=upserter_config)
 
     file_locations = globber.glob(collection_path)
+    path_convention = 'windows' if os.name == 'nt' else 'posix'
+
+    if dry_run:
+        for file_location in file_locations:
+            print(f'process index: {repr(file_location.path)}')
+        return
+
+    def screen_and_index(file_location):
+        screening_result = screener.screen([file_location])[0]
+        if screening_result.status != ScreeningStatus.APPROVED:
+            return None, screening_result.reason
+        assert screening_result.file_stamp is not None
+        return html_indexer.index(file_location, screening_result.file_stamp), None
 
-    indexed_document = None
-    documents = []
-    for file_location in file_locations:
-        path_convention = 'windows' if os.name == 'nt' else 'posix'
-        file_path = file_location.to_filesystem_path(path_convention=path_convention)
-        try:
-            if dry_run:
-                print(f'process index: {repr(file_location.path)}')
+    # Pipeline: screening + indexing run ahead on worker threads (bounded
+    # window, results taken in glob order), this thread is the only sqlite
+    # writer and upserts whole batches in one transaction each.
+    batch = []
+    with upserter, ThreadPoolExecutor(max_workers=INDEX_MAX_WORKERS) as executor:
+        pending = deque()
+        locations = iter(file_locations)
+        for file_location in itertools.islice(locations, INDEX_QUEUE_SIZE):
+            pending.append((file_location, executor.submit(screen_and_index, file_location)))
+        while pending:
+            file_location, future = pending.popleft()
+            for next_location in itertools.islice(locations, 1):
+                pending.append((next_location, executor.submit(screen_and_index, next_location)))
+            file_path = file_location.to_filesystem_path(path_convention=path_convention)
+            try:
+                indexed_document, reason = future.result()
+            except Exception as e:
+                print(f'skipped index: {repr(file_path)}, reason: {e}')
+                traceback.print_exception(e)
+                for _, f in pending:
+                    f.cancel()
+                break
+            if indexed_document is None:
+                print(f'skipped index: {repr(file_path)}, reason: {reason}')
                 continue
-            screening_result = screener.screen([file_location])[0]
-            if screening_result.status == ScreeningStatus.APPROVED:
-                assert screening_result.file_stamp is not None
-                file_stamp = screening_result.file_stamp
-                indexed_document = html_indexer.index(file_location, file_stamp)
-                upserter.upsert(indexed_document)
-                print(f'success index: {repr(file_path)}, id: {indexed_document.file_id}')
-                documents.append(indexed_document)
-            else:
-                print(f'skipped index: {repr(file_path)}, reason: {screening_result.reason}')
-        except Exception as e:
-            print(f'skipped index: {repr(file_path)}, reason: {e}')
-            print(e.with_traceback())
-            break
+            print(f'success index: {repr(file_path)}, id: {indexed_document.file_id}')
+            batch.append(indexed_document)
+            if len(batch) >= UPSERT_BATCH_SIZE:
+                upserter.upsert_many(batch)
+                batch = []
+        if batch:
+            upserter.upsert_many(batch)
 
 import argparse
 import sys
 
+_TRUE_STRS = frozenset(('1','y','t','yes','true','on'))
+_FALSE_STRS = frozenset(('0','n','f','no','false','off'))
+
 def str_to_bool(s: str):
-    if s.isupper():
-        ss = s.lower()
-    else:
-        ss = s[0].lower() + s[1:]
-    if ss in ('1','y','t','yes','true','on'):
+    ss = s.lower()
+    if ss in _TRUE_STRS:
         return True
-    elif ss in ('0','n','f','no','false','off'):
+    elif ss in _FALSE_STRS:
         return False
     else:
         raise argparse.ArgumentTypeError('Boolean value expected.')
@@ -85,10 +118,8 @@ class Config(BaseModel):
     
 def main(argv):
     args = parse_args(argv)
-    config_json = {}
     print(args.config_path)
-    with open(args.config_path, 'r') as f:
-        config_json = json.load(f)
+    config_json = load_jsonc(args.config_path)
     config = Config(**config_json)
     if args.dry_run is not None:
         # override the config setting
@@ -0,0 +1,147 @@
+import threading
+from pathlib import Path
+from typing import Optional
+from datetime import datetime
+
+import pytest
+
+from pkms.core.model import IndexedDocument, ResolutionStatus
+from pkms.component.resolver import UriResolver
+from pkms.component.upserter import Sqlite3Upserter
+
+# --------------------------
+# helpers
+# --------------------------
+
+def now_iso() -> str:
+    return datetime.now().isoformat()
+
+def make_doc(file_id: str, file_extension: str = ".md", file_uid: str | None = None) -> IndexedDocument:
+    return IndexedDocument(
+        file_id=file_id,
+        file_uid=file_uid,
+        file_uri=f"file:///tmp/{file_id}{file_extension}",
+        file_size=256,
+        file_hash_sha256=f"sha256-{file_id}",
+        file_extension=file_extension,
+        file_kind="editable",
+        file_created_datetime=now_iso(),
+        file_modified_datetime=now_iso(),
+        index_created_datetime=now_iso(),
+        index_updated_datetime=now_iso(),
+        title=f"title of {file_id}",
+        importance=0,
+        origin_uri=None,
+        text="hello",
+        extra={},
+    )
+
+# --------------------------
+# fixtures
+# --------------------------
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    path = (tmp_path / "test.db").as_posix()
+    with Sqlite3Upserter(Sqlite3Upserter.Config(db_path=path)) as upserter:
+        upserter.upsert(make_doc("0001-01-01-0001"))
+        upserter.upsert(make_doc("0001-01-01-0002", file_extension=".odt", file_uid="uid-2"))
+    return path
+
+@pytest.fixture
+def resolver(db_path: str):
+    r = UriResolver(UriResolver.Config(db_path=db_path))
+    yield r
+    r.close()
+
+# --------------------------
+# tests
+# --------------------------
+
+def test_resolve_by_id(resolver: UriResolver):
+    target = resolver.resolve("pkms:///file/id:0001-01-01-0001.md")
+    assert target.status == ResolutionStatus.OK
+    assert target.file_id == "0001-01-01-0001"
+    assert target.file_extension == ".md"
+    assert target.title == "title of 0001-01-01-0001"
+    assert target.file_location.uri == "file:///tmp/0001-01-01-0001.md"
+
+def test_resolve_by_uid(resolver: UriResolver):
+    target = resolver.resolve("pkms:///file/uid:UID-2.odt")
+    assert target.file_id == "0001-01-01-0002"
+
+def test_resolve_by_sha256(resolver: UriResolver):
+    target = resolver.resolve("pkms:///file/sha256:sha256-0001-01-01-0002.odt")
+    assert target.file_id == "0001-01-01-0002"
+
+@pytest.mark.parametrize("uri", [
+    "PKMS:///file/id:0001-01-01-0001.md",
+    "pkms://localhost/file/id:0001-01-01-0001.md",
+    "pkms:/file/id:0001-01-01-0001.md",
+    "pkms:///file/id:0001-01-01-0001.md?q=1#section",
+])
+def test_resolve_accepts_uri_variants(resolver: UriResolver, uri: str):
+    assert resolver.resolve(uri).file_id == "0001-01-01-0001"
+
+def test_resolve_requires_matching_extension(resolver: UriResolver):
+    with pytest.raises(LookupError):
+        resolver.resolve("pkms:///file/id:0001-01-01-0001.odt")
+
+@pytest.mark.parametrize("uri", [
+    "file:///file/id:0001-01-01-0001.md",
+    "pkms:///note/id:0001-01-01-0001.md",
+    "pkms:///file/0001-01-01-0001.md",
+    "pkms:///file/id:0001-01-01-0001",
+    "pkms:///file/name:0001-01-01-0001.md",
+    "pkms:///file/id:0001-01-01-0001.md/extra",
+])
+def test_resolve_rejects_invalid_uri(resolver: UriResolver, uri: str):
+    with pytest.raises(ValueError):
+        resolver.resolve(uri)
+
+@pytest.mark.parametrize("pool_size", [None, 1, 2])
+def test_resolve_concurrently(db_path: str, pool_size: Optional[int]):
+    resolver = UriResolver(UriResolver.Config(db_path=db_path, pool_size=pool_size))
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(50):
+                assert resolver.resolve("pkms:///file/id:0001-01-01-0001.md").file_id == "0001-01-01-0001"
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    resolver.close()
+    assert errors == []
+
+def test_resolve_db_path_with_special_characters(tmp_path: Path):
+    path = (tmp_path / "my notes #1%.db").as_posix()
+    with Sqlite3Upserter(Sqlite3Upserter.Config(db_path=path)) as upserter:
+        upserter.upsert(make_doc("0001-01-01-0001"))
+
+    resolver = UriResolver(UriResolver.Config(db_path=path))
+    try:
+        assert resolver.resolve("pkms:///file/id:0001-01-01-0001.md").file_id == "0001-01-01-0001"
+    finally:
+        resolver.close()
+
+def test_close_is_idempotent(resolver: UriResolver):
+    assert resolver.close() is True
+    assert resolver.close() is False
+
+    with pytest.raises(RuntimeError):
+        resolver.resolve("pkms:///file/id:0001-01-01-0001.md")
+
+# --------------------------
+# script entry point
+# --------------------------
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__]))
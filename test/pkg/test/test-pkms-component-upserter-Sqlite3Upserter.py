@@ -1,5 +1,9 @@
 
-from pkms.component.upserter._Sqlite3Upserter import UPSERT_SQL
+from pkms.component.upserter._Sqlite3Upserter import (
+    UPSERT_SQL,
+    UPSERT_PARAM_NAMES,
+    to_files_db_record,
+)
 from pkms.core.model import FilesDbRecord
 from pkms.core.utility import assert_sql_model_aligned
 
@@ -47,6 +51,22 @@ def make_doc(file_id: str, title: str = "title") -> IndexedDocument:
         extra={},
     )
 
+def test_upsert_params_order_match_file_db_record():
+    assert set(UPSERT_PARAM_NAMES) == set(FilesDbRecord.model_fields)
+
+    doc = make_doc("file-1")
+    doc.file_uid = "uid-1"
+    doc.origin_uri = "https://example.com"
+    doc.extra = {"key": "value"}
+    record = to_files_db_record(doc, now_iso_="now")
+    for name in UPSERT_PARAM_NAMES:
+        if name in ("record_created_datetime", "record_updated_datetime"):
+            assert getattr(record, name) == "now"
+        elif name == "extra":
+            assert record.extra == '{"key":"value"}'
+        else:
+            assert getattr(record, name) == getattr(doc, name), name
+
 # --------------------------
 # fixtures
 # --------------------------
@@ -106,6 +126,39 @@ def test_transaction_batch_commit(upserter: Sqlite3Upserter):
     assert count == 3
 
 
+def test_upsert_many(upserter: Sqlite3Upserter):
+    docs = [make_doc(f"file-{i}") for i in range(5)]
+    docs.append(make_doc("file-0", title="v2"))
+
+    upserter.upsert_many(docs, chunk_size=2)
+
+    conn = sqlite3.connect(upserter.config.db_path)
+    count = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    title = conn.execute("SELECT title FROM files WHERE file_id = ?", ("file-0",)).fetchone()[0]
+
+    assert count == 5
+    assert title == "v2"
+
+
+def test_upsert_many_streams_generator(upserter: Sqlite3Upserter):
+    def docs():
+        for i in range(7):
+            yield make_doc(f"file-{i}")
+        bad = make_doc("bad")
+        bad.file_uri = None  # type: ignore
+        yield bad
+
+    # chunks: [0,1] [2,3] | [4,5] [6,bad], only the last transaction is rolled back
+    with pytest.raises(Exception):
+        upserter.upsert_many(docs(), chunk_size=2, commit_every=2)
+
+    conn = sqlite3.connect(upserter.config.db_path)
+    count = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    assert count == 4
+    assert not upserter._connection.in_transaction
+
+
 def test_transaction_rollback_on_error(upserter: Sqlite3Upserter):
     good = make_doc("good")
     bad = make_doc("bad")
@@ -0,0 +1,43 @@
+import pathlib
+
+import commentjson
+import pytest
+
+from pkms.core.utility import (
+    loads_jsonc,
+    load_jsonc,
+)
+
+JSONC_TEXT = """
+{
+  // line comment
+  "name": "notes", # hash comment
+  "base_uri": "file:///home/user/notes", // markers inside strings are kept
+  "pattern": "**/*.md",
+  "hash": "#not-a-comment",
+  "quoted": "say \\"hi\\" // still a string",
+  "nested": {"list": [1, 2.5, true, null,], "comma": ", ]"},
+  "last": 1, // trailing comma, then a comment
+}
+"""
+
+def test_loads_jsonc_matches_commentjson():
+    assert loads_jsonc(JSONC_TEXT) == commentjson.loads(JSONC_TEXT)
+    assert loads_jsonc(JSONC_TEXT.encode('utf-8')) == commentjson.loads(JSONC_TEXT)
+
+def test_loads_jsonc_block_comment():
+    assert loads_jsonc('{/* a\n b */"a": /* c */ 1}') == {"a": 1}
+
+def test_load_jsonc_file(tmp_path):
+    path = tmp_path / "config.jsonc"
+    path.write_text(JSONC_TEXT, encoding='utf-8')
+    assert load_jsonc(path) == commentjson.loads(JSONC_TEXT)
+
+def test_load_jsonc_repo_config():
+    test_dir = pathlib.Path(__file__).parents[2]
+    path = test_dir / "data" / "ingest-config.jsonc"
+    with open(path) as f:
+        assert load_jsonc(path) == commentjson.load(f)
+
+if __name__ == '__main__':
+    pytest.main([__file__])